@@ -1,16 +1,28 @@
-import requests, io, base64
+import io, base64
 from tenacity import retry, stop_after_attempt, wait_exponential
 from utils import logger, validate_env
+from http_transport import get_session
+from keyword_matcher import KeywordMatcher
 from PIL import Image
 import pillow_avif
 import json
 
+PRIORITY_SPORT_MATCHER = KeywordMatcher(['cricket', 'football', 'soccer', 'ipl', 'ucl'])
+
+# Image scenario keywords for CloudflareClient (compiled once, matched in one pass per title)
+IMAGE_CRICKET_TERMS = ['cricket', 'batting', 'bowling', 'wicket', 'over']
+IMAGE_FOOTBALL_TERMS = ['football', 'soccer', 'goal', 'striker', 'midfielder']
+IMAGE_SCENARIO_MATCHER = KeywordMatcher(
+    ['ipl', 'indian premier league', 'test cricket', 'test match', 't20', 'twenty20', 'world cup',
+     'premier league', 'champions league', 'ucl'],
+    IMAGE_CRICKET_TERMS, IMAGE_FOOTBALL_TERMS
+)
+
 class SerperClient:
     def __init__(self):
         self.key_main = validate_env('SERPER_KEY_MAIN')
         self.key_backup = validate_env('SERPER_KEY_BACKUP', False)
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'})
+        self.session = get_session()
         self.calls = 0
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
@@ -36,8 +48,7 @@ class SerperClient:
         # Filter for cricket/football priority
         priority_news = []
         for r in news:
-            title_lower = r['title'].lower()
-            if any(sport in title_lower for sport in ['cricket', 'football', 'soccer', 'ipl', 'ucl']):
+            if PRIORITY_SPORT_MATCHER.matches_any(r['title']):
                 priority_news.append(r)
         
         # Use all news if no priority matches
@@ -58,7 +69,7 @@ class OpenRouterClient:
     def __init__(self):
         self.api_key = validate_env('OPENROUTER_API_KEY')
         self.model = validate_env('OPENROUTER_MODEL', False) or 'deepseek/deepseek-chat'
-        self.session = requests.Session()
+        self.session = get_session()
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
     def generate(self, prompt, max_tokens=4000):
@@ -87,6 +98,7 @@ class CloudflareClient:
         self.account_id = validate_env('CLOUDFLARE_ACCOUNT_ID', False)
         self.token = validate_env('CLOUDFLARE_TOKEN', False)
         self.enabled = bool(self.account_id and self.token)
+        self.session = get_session()
 
     @retry(stop=stop_after_attempt(2), wait=wait_exponential(min=2, max=8))
     def generate_image(self, prompt, width=1200, height=672):
@@ -99,32 +111,29 @@ class CloudflareClient:
         width = (width // 8) * 8
         height = (height // 8) * 8
         
-        # Create highly specific, relevant prompts based on article title
-        enhanced_prompt = prompt.lower()
-        
-        # Extract key terms from title for better image relevance
-        title_lower = prompt.lower()
+        # Extract key terms from title for better image relevance (single pass)
+        hits = IMAGE_SCENARIO_MATCHER.find(prompt)
         
         # Cricket-specific scenarios
-        if 'ipl' in title_lower or 'indian premier league' in title_lower:
+        if 'ipl' in hits or 'indian premier league' in hits:
             image_prompt = "vibrant IPL cricket stadium packed with cheering fans, professional cricketers in colorful team jerseys, intense match action, floodlights, energetic atmosphere, photorealistic sports photography, 8k ultra detailed"
-        elif 'test cricket' in title_lower or 'test match' in title_lower:
+        elif 'test cricket' in hits or 'test match' in hits:
             image_prompt = "traditional test cricket match, players in white uniforms, green cricket field, classic stadium, professional sports photography, bright daylight, photorealistic, 8k quality"
-        elif 't20' in title_lower or 'twenty20' in title_lower:
+        elif 't20' in hits or 'twenty20' in hits:
             image_prompt = "exciting T20 cricket match, dynamic batting action, packed stadium with enthusiastic crowd, colorful team jerseys, floodlit evening match, photorealistic sports photography, 8k ultra detailed"
-        elif 'world cup' in title_lower and 'cricket' in title_lower:
+        elif 'world cup' in hits and 'cricket' in hits:
             image_prompt = "ICC Cricket World Cup match, international cricket stadium filled with fans, players in national team colors, dramatic match moment, professional sports photography, photorealistic, 8k quality"
-        elif any(kw in title_lower for kw in ['cricket', 'batting', 'bowling', 'wicket', 'over']):
+        elif hits.intersection(IMAGE_CRICKET_TERMS):
             image_prompt = "professional cricket match action, batsman hitting ball, bowler in delivery stride, packed stadium atmosphere, bright daylight, photorealistic sports photography, 8k ultra detailed"
         
         # Football-specific scenarios
-        elif 'premier league' in title_lower:
+        elif 'premier league' in hits:
             image_prompt = "English Premier League football match, iconic stadium packed with fans, players in team jerseys competing for ball, intense action moment, professional sports photography, photorealistic, 8k quality"
-        elif 'champions league' in title_lower or 'ucl' in title_lower:
+        elif 'champions league' in hits or 'ucl' in hits:
             image_prompt = "UEFA Champions League football match, massive European stadium, players in club jerseys, dramatic match action, floodlit evening, photorealistic sports photography, 8k ultra detailed"
-        elif 'world cup' in title_lower and 'football' in title_lower:
+        elif 'world cup' in hits and 'football' in hits:
             image_prompt = "FIFA World Cup football match, international stadium filled with passionate fans, players in national team colors, exciting match moment, professional sports photography, photorealistic, 8k quality"
-        elif any(kw in title_lower for kw in ['football', 'soccer', 'goal', 'striker', 'midfielder']):
+        elif hits.intersection(IMAGE_FOOTBALL_TERMS):
             image_prompt = "professional football match action, players competing for ball, packed stadium with cheering crowd, dynamic sports moment, bright stadium lights, photorealistic sports photography, 8k ultra detailed"
         
         # Generic sports fallback
@@ -140,7 +149,7 @@ class CloudflareClient:
         }
         
         try:
-            resp = requests.post(url, headers=headers, json=data, timeout=30)
+            resp = self.session.post(url, headers=headers, json=data, timeout=30)
             resp.raise_for_status()
             
             # Handle binary response
@@ -167,9 +176,9 @@ class WordPressClient:
         self.url = validate_env('WP_URL').rstrip('/')
         self.username = validate_env('WP_USERNAME')
         self.password = validate_env('WP_APP_PASSWORD')
-        self.session = requests.Session()
-        self.session.auth = (self.username, self.password)
-        self.session.headers.update({'Content-Type': 'application/json'})
+        # Shared pool: credentials go with each request, never onto the session
+        self.session = get_session()
+        self.auth = (self.username, self.password)
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
     def upload_media(self, image_data, filename='image.avif'):
@@ -182,6 +191,7 @@ class WordPressClient:
             f"{self.url}/wp-json/wp/v2/media",
             headers=headers,
             data=image_data,
+            auth=self.auth,
             timeout=30
         )
         resp.raise_for_status()
@@ -208,7 +218,7 @@ class WordPressClient:
             logger.info(f"Using auth: {self.username}")
             logger.info(f"Status: {status}")
             
-            resp = self.session.post(f"{self.url}/wp-json/wp/v2/posts", json=data, timeout=30)
+            resp = self.session.post(f"{self.url}/wp-json/wp/v2/posts", json=data, auth=self.auth, timeout=30)
             
             logger.info(f"WordPress response status: {resp.status_code}")
             
@@ -239,7 +249,7 @@ class WordPressClient:
     def get_categories(self):
         """Get all WordPress categories"""
         try:
-            resp = self.session.get(f"{self.url}/wp-json/wp/v2/categories?per_page=100", timeout=10)
+            resp = self.session.get(f"{self.url}/wp-json/wp/v2/categories?per_page=100", auth=self.auth, timeout=10)
             resp.raise_for_status()
             categories = resp.json()
             return {cat['name'].lower(): cat['id'] for cat in categories}
@@ -254,6 +264,7 @@ class WordPressClient:
             # Search for existing tag
             resp = self.session.get(
                 f"{self.url}/wp-json/wp/v2/tags?search={tag_name}",
+                auth=self.auth,
                 timeout=10
             )
             resp.raise_for_status()
@@ -268,6 +279,7 @@ class WordPressClient:
             resp = self.session.post(
                 f"{self.url}/wp-json/wp/v2/tags",
                 json={'name': tag_name},
+                auth=self.auth,
                 timeout=10
             )
             resp.raise_for_status()
@@ -8,14 +8,63 @@ import requests
 import time
 from tenacity import retry, stop_after_attempt, wait_exponential
 from utils import logger
+from http_transport import get_session
+from keyword_matcher import KeywordMatcher, detect_article_type
 
 class APIFreeClient:
+    # FOOTBALL TEAMS - Team names and colors
+    FOOTBALL_TEAMS = {
+        'liverpool': ('red', 'Liverpool'),
+        'manchester united': ('red', 'Man United'),
+        'manchester city': ('sky blue', 'Man City'),
+        'chelsea': ('blue', 'Chelsea'),
+        'arsenal': ('red', 'Arsenal'),
+        'tottenham': ('white', 'Tottenham'),
+        'aston villa': ('claret and blue', 'Aston Villa'),
+        'villa': ('claret and blue', 'Aston Villa'),
+        'newcastle': ('black and white', 'Newcastle'),
+        'barcelona': ('blue and red', 'Barcelona'),
+        'real madrid': ('white', 'Real Madrid'),
+        'bayern': ('red', 'Bayern'),
+        'psg': ('blue', 'PSG'),
+    }
+
+    # CRICKET TEAMS - Team names and colors
+    CRICKET_TEAMS = {
+        'india': ('blue', 'India'),
+        'pakistan': ('green', 'Pakistan'),
+        'australia': ('yellow', 'Australia'),
+        'england': ('blue', 'England'),
+        'south africa': ('green', 'South Africa'),
+        'new zealand': ('black', 'New Zealand'),
+        'sri lanka': ('blue', 'Sri Lanka'),
+        'west indies': ('maroon', 'West Indies'),
+        'bangladesh': ('green', 'Bangladesh'),
+        'afghanistan': ('blue', 'Afghanistan'),
+        'italy': ('blue', 'Italy'),
+    }
+    
+    # Player names for personalization
+    PLAYER_KEYWORDS = ['kohli', 'rohit', 'bumrah', 'dhoni', 'babar', 'miller', 'elliott', 'salah', 'haaland', 'mbappe']
+    
+    # Event type keywords for the text overlay
+    EVENT_KEYWORDS = ['final', 'semi-final', 'quarter-final', 'debut', 'boost', 'cleared', 'puzzle', 'showdown', 'clash', 'thriller']
+    
+    CRICKET_TERMS = ['cricket', 'ipl', 't20', 'test', 'odi', 'wicket', 'batting', 'bowling', 'world cup']
+    FOOTBALL_TERMS = ['football', 'soccer', 'premier league', 'champions league', 'ucl', 'goal', 'villa', 'liverpool']
+    TOURNAMENT_TERMS = ['t20 world cup', 't20 wc', 'world cup', 'ipl', 't20', 'test', 'champions league', 'ucl', 'premier league']
+    
+    # Compiled once at import; one pass over the title answers every lookup below
+    TITLE_MATCHER = KeywordMatcher(FOOTBALL_TEAMS, CRICKET_TEAMS, PLAYER_KEYWORDS, EVENT_KEYWORDS,
+                                   CRICKET_TERMS, FOOTBALL_TERMS, TOURNAMENT_TERMS)
+    
     def __init__(self, api_key=None):
         """Initialize APIFree.ai client"""
         import os
         self.api_key = api_key or os.getenv('APIFREE_API_KEY')
         self.base_url = "https://api.apifree.ai"
         self.enabled = bool(self.api_key)
+        self.session = get_session()  # Submit, polling and download reuse one connection
         
         if not self.enabled:
             logger.warning("APIFree.ai not configured (no API key)")
@@ -63,7 +112,7 @@ class APIFreeClient:
             logger.info(f"📤 Submitting to APIFree.ai (Z-Image Turbo)...")
             logger.debug(f"Prompt length: {len(prompt)} chars, Steps: {num_inference_steps}")
             
-            submit_resp = requests.post(
+            submit_resp = self.session.post(
                 f"{self.base_url}/v1/image/submit",
                 headers=headers,
                 json=payload,
@@ -92,7 +141,7 @@ class APIFreeClient:
                 
                 # Check status
                 result_url = f"{self.base_url}/v1/image/{request_id}/result"
-                result_resp = requests.get(result_url, headers=headers, timeout=10)
+                result_resp = self.session.get(result_url, headers=headers, timeout=10)
                 result_resp.raise_for_status()
                 
                 result_data = result_resp.json()
@@ -117,7 +166,7 @@ class APIFreeClient:
                     logger.info(f"✅ Image generated successfully (cost: ${cost})")
                     
                     # Download image
-                    img_resp = requests.get(image_url, timeout=30)
+                    img_resp = self.session.get(image_url, timeout=30)
                     img_resp.raise_for_status()
                     
                     image_data = img_resp.content
@@ -164,60 +213,19 @@ class APIFreeClient:
         Returns:
             bytes: Image data
         """
-        title_lower = title.lower()
+        # Every keyword lookup below reads from this single pass over the title
+        hits = self.TITLE_MATCHER.find(title)
         
         # Detect article type from title if not specified
         if article_type == "match":
-            if any(kw in title_lower for kw in ['boycott', 'ban', 'suspended', 'controversy', 'protest', 'political']):
-                article_type = "political"
-            elif any(kw in title_lower for kw in ['transfer', 'signs', 'joins', 'deal', 'contract', '£', '$']):
-                article_type = "transfer"
-            elif any(kw in title_lower for kw in ['injury', 'injured', 'ruled out', 'sidelined', 'fitness']):
-                article_type = "injury"
-            elif any(kw in title_lower for kw in ['vs', 'v ', 'beat', 'defeat', 'win', 'loss', 'draw', 'final', 'semi-final']):
-                article_type = "match"
-            else:
-                article_type = "news"
+            article_type = detect_article_type(title)
         
         # Extract context from title for better image matching
         
-        # FOOTBALL TEAMS - Extract team names and colors
-        football_teams = {
-            'liverpool': ('red', 'Liverpool'),
-            'manchester united': ('red', 'Man United'),
-            'manchester city': ('sky blue', 'Man City'),
-            'chelsea': ('blue', 'Chelsea'),
-            'arsenal': ('red', 'Arsenal'),
-            'tottenham': ('white', 'Tottenham'),
-            'aston villa': ('claret and blue', 'Aston Villa'),
-            'villa': ('claret and blue', 'Aston Villa'),
-            'newcastle': ('black and white', 'Newcastle'),
-            'barcelona': ('blue and red', 'Barcelona'),
-            'real madrid': ('white', 'Real Madrid'),
-            'bayern': ('red', 'Bayern'),
-            'psg': ('blue', 'PSG'),
-        }
-        
-        # CRICKET TEAMS - Extract team names and colors
-        cricket_teams = {
-            'india': ('blue', 'India'),
-            'pakistan': ('green', 'Pakistan'),
-            'australia': ('yellow', 'Australia'),
-            'england': ('blue', 'England'),
-            'south africa': ('green', 'South Africa'),
-            'new zealand': ('black', 'New Zealand'),
-            'sri lanka': ('blue', 'Sri Lanka'),
-            'west indies': ('maroon', 'West Indies'),
-            'bangladesh': ('green', 'Bangladesh'),
-            'afghanistan': ('blue', 'Afghanistan'),
-            'italy': ('blue', 'Italy'),
-        }
-        
         # Extract player names for personalization
-        player_keywords = ['kohli', 'rohit', 'bumrah', 'dhoni', 'babar', 'miller', 'elliott', 'salah', 'haaland', 'mbappe']
         found_player = None
-        for player in player_keywords:
-            if player in title_lower:
+        for player in self.PLAYER_KEYWORDS:
+            if player in hits:
                 found_player = player.title()
                 break
         
@@ -231,23 +239,22 @@ class APIFreeClient:
             key_details.extend(numbers[:2])  # Max 2 numbers
         
         # Extract event type keywords
-        event_keywords = ['final', 'semi-final', 'quarter-final', 'debut', 'boost', 'cleared', 'puzzle', 'showdown', 'clash', 'thriller']
-        for keyword in event_keywords:
-            if keyword in title_lower:
+        for keyword in self.EVENT_KEYWORDS:
+            if keyword in hits:
                 key_details.append(keyword.title())
                 break
         
         # Detect sport and context
-        is_cricket = any(kw in title_lower for kw in ['cricket', 'ipl', 't20', 'test', 'odi', 'wicket', 'batting', 'bowling', 'world cup'])
-        is_football = any(kw in title_lower for kw in ['football', 'soccer', 'premier league', 'champions league', 'ucl', 'goal', 'villa', 'liverpool'])
+        is_cricket = bool(hits.intersection(self.CRICKET_TERMS))
+        is_football = bool(hits.intersection(self.FOOTBALL_TERMS))
         
         # CRICKET IMAGE GENERATION
         if is_cricket:
             # Find teams mentioned
             teams_found = []
             team_colors = []
-            for team_key, (color, name) in cricket_teams.items():
-                if team_key in title_lower:
+            for team_key, (color, name) in self.CRICKET_TEAMS.items():
+                if team_key in hits:
                     teams_found.append(name)
                     team_colors.append(color)
             
@@ -263,15 +270,15 @@ class APIFreeClient:
             player_text = f" featuring {found_player}" if found_player else ""
             
             # Tournament context
-            if 't20 world cup' in title_lower or 't20 wc' in title_lower:
+            if 't20 world cup' in hits or 't20 wc' in hits:
                 tournament = 'T20 World Cup'
-            elif 'world cup' in title_lower:
+            elif 'world cup' in hits:
                 tournament = 'World Cup'
-            elif 'ipl' in title_lower:
+            elif 'ipl' in hits:
                 tournament = 'IPL'
-            elif 't20' in title_lower:
+            elif 't20' in hits:
                 tournament = 'T20'
-            elif 'test' in title_lower:
+            elif 'test' in hits:
                 tournament = 'Test Match'
             else:
                 tournament = 'Cricket'
@@ -308,8 +315,8 @@ class APIFreeClient:
             # Find teams mentioned
             teams_found = []
             team_colors = []
-            for team_key, (color, name) in football_teams.items():
-                if team_key in title_lower:
+            for team_key, (color, name) in self.FOOTBALL_TEAMS.items():
+                if team_key in hits:
                     teams_found.append(name)
                     team_colors.append(color)
             
@@ -325,11 +332,11 @@ class APIFreeClient:
             player_text = f" featuring {found_player}" if found_player else ""
             
             # Tournament context
-            if 'champions league' in title_lower or 'ucl' in title_lower:
+            if 'champions league' in hits or 'ucl' in hits:
                 tournament = 'Champions League'
-            elif 'premier league' in title_lower:
+            elif 'premier league' in hits:
                 tournament = 'Premier League'
-            elif 'world cup' in title_lower:
+            elif 'world cup' in hits:
                 tournament = 'World Cup'
             else:
                 tournament = 'Football'
@@ -1,15 +1,289 @@
 """
 Advanced Article Extraction Module
 Uses multiple professional libraries to extract full article content
+The page is downloaded once per URL and shared by every strategy
 """
 
-import requests
+import time
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import lxml.html
 from newspaper import Article
 import trafilatura
 from readability import Document
-from bs4 import BeautifulSoup
 import re
-from utils import logger
+from utils import logger, record_extraction, record_page_download
+from text_cleaner import clean_text
+from http_transport import get_session
+from http_cache import fetch_page, get_extracted_text, save_extracted_text, save_page_meta
+from extraction_stats import domain_of, plan_strategies
+from site_profiles import profile_for
+from structured_data import find_article
+from page_variants import variant_url, learn_variant
+from domain_blocks import classify_error, classify_page, record_block
+from boilerplate import strip_boilerplate
+from config import (EXTRACTION_MODE, EXTRACTION_CASCADE, EXTRACTION_QUALITY_THRESHOLD, EXTRACTION_DEADLINE_SECONDS,
+                    EXTRACTION_WORKERS, EXTRACTION_WORKER_MEMORY_MB, EXTRACTION_MAX_TASKS_PER_CHILD,
+                    EXTRACTION_SITE_PROFILES, EXTRACTION_JSON_LD, EXTRACTION_PAGE_VARIANTS, EXTRACTION_VARIANT_SECONDS,
+                    FEED_FULL_TEXT_MIN_CHARS)
+
+# Part of the extracted-text cache key: bump when strategies or cleaning change
+EXTRACTOR_VERSION = '3'
+
+# Phrases that mark a paragraph as page furniture rather than article text
+BOILERPLATE_MARKERS = re.compile(
+    r'cookie|subscribe|sign up|newsletter|follow us|all rights reserved|©|copyright|'
+    r'advertisement|related articles|read more|click here|share this', re.IGNORECASE)
+_SENTENCE_END = re.compile(r'[.!?]["\'”’)]?(?:\s|$)')
+
+
+def score_extraction(text):
+    """
+    Quality score of an extracted article, 0.0 - 1.0
+    
+    Combines length, paragraph count, boilerplate ratio and link density. Strategies
+    return plain text, so link density is estimated from navigation-like lines
+    (short, no sentence punctuation), which is what menus and link lists become.
+    """
+    if not text:
+        return 0.0
+    
+    paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+    if len(paragraphs) > 1:
+        paragraph_count = len(paragraphs)
+    else:
+        # Whitespace was collapsed into one block: estimate ~3 sentences per paragraph
+        paragraph_count = len(_SENTENCE_END.findall(text)) / 3
+    
+    # Judge boilerplate and navigation line by line (sentence by sentence in one block)
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) < 2:
+        lines = [part for part in re.split(r'(?<=[.!?])\s+', text.strip()) if part]
+    boilerplate_chars = sum(len(line) for line in lines if BOILERPLATE_MARKERS.search(line) and len(line) < 200)
+    nav_chars = sum(len(line) for line in lines if len(line) < 40 and not _SENTENCE_END.search(line))
+    total = sum(len(line) for line in lines) or 1
+    
+    length_score = min(len(text) / 2500, 1.0)
+    paragraph_score = min(paragraph_count / 5, 1.0)
+    boilerplate_ratio = boilerplate_chars / total
+    link_density = nav_chars / total
+    
+    return round(0.4 * length_score + 0.2 * paragraph_score
+                 + 0.2 * (1 - boilerplate_ratio) + 0.2 * (1 - link_density), 3)
+
+
+def parse_html(html):
+    """Parse a page once into an lxml tree shared by every strategy"""
+    return lxml.html.document_fromstring(html)
+
+
+def _own_tree(html, tree):
+    """The tree a strategy may modify: the one it was handed (SharedTree.take), or a fresh parse"""
+    return tree if tree is not None else parse_html(html)
+
+
+class SharedTree:
+    """
+    The page parsed once, handed whole to the first strategy that modifies a tree
+
+    A cascade usually stops at its first tree strategy, so the page is parsed once and
+    never copied; tree strategies after it parse the markup themselves.
+    """
+
+    __slots__ = ('tree',)
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def take(self):
+        """The tree if nobody took it yet, else None"""
+        tree, self.tree = self.tree, None
+        return tree
+
+
+def find_page_image(tree):
+    """og:image (or twitter:image) URL from a parsed page, without modifying it"""
+    for xpath in ('//meta[@property="og:image"]/@content', '//meta[@name="twitter:image"]/@content'):
+        values = tree.xpath(xpath)
+        if values and values[0].strip():
+            return values[0].strip()
+    return None
+
+
+def _paragraph_text(container, min_length=30):
+    texts = (p.text_content().strip() for p in container.iter('p'))
+    return '\n\n'.join(text for text in texts if len(text) > min_length)
+
+
+def extract_with_newspaper(url, html, tree=None):
+    """
+    Extract using newspaper3k library
+    Excellent for news sites, handles JavaScript
+    (newspaper only accepts markup, so it still parses on its own)
+    """
+    article = Article(url)
+    article.download(input_html=html)  # Already fetched, no second request
+    article.parse()
+
+    # Get full text
+    text = article.text
+
+    # Add title if not in text
+    if article.title and article.title not in text:
+        text = f"{article.title}\n\n{text}"
+
+    # Clean and validate
+    text = clean_text(text)
+
+    if len(text) > 300:
+        return text
+    return None
+
+
+def extract_with_trafilatura(url, html, tree=None):
+    """
+    Extract using trafilatura library
+    Excellent for general articles, very accurate
+    """
+    # Extract with all features enabled (trafilatura prunes the tree it is given)
+    text = trafilatura.extract(
+        _own_tree(html, tree),
+        url=url,
+        include_comments=False,
+        include_tables=True,
+        no_fallback=False,
+        favor_precision=False,  # Favor recall to get more content
+        favor_recall=True
+    )
+
+    if text:
+        text = clean_text(text)
+        if len(text) > 300:
+            return text
+
+    return None
+
+
+def extract_with_readability(url, html, tree=None):
+    """
+    Extract using readability-lxml
+    Good for complex layouts and paywalls
+    """
+    # Use readability to extract main content (it drops nodes from the tree it is given)
+    doc = Document(_own_tree(html, tree))
+    html_content = doc.summary()
+
+    # Parse the (small) summary HTML to text
+    summary = lxml.html.fragment_fromstring(html_content, create_parent='div')
+
+    # Remove unwanted elements
+    for element in summary.xpath('.//script|.//style|.//nav|.//footer|.//aside'):
+        element.drop_tree()
+
+    # Get text from paragraphs
+    text = _paragraph_text(summary)
+
+    # Add title if available
+    title = doc.title()
+    if title and title not in text:
+        text = f"{title}\n\n{text}"
+
+    text = clean_text(text)
+
+    if len(text) > 300:
+        return text
+    return None
+
+
+_FALLBACK_DROP_XPATH = '//script|//style|//nav|//footer|//aside|//header|//iframe'
+_FALLBACK_DROP_CLASSES = ('ad', 'advertisement', 'social', 'related', 'comments', 'sidebar')
+_CONTENT_CLASS = re.compile(r'(content|article|story|post)', re.I)
+
+
+def extract_with_beautifulsoup(url, html, tree=None):
+    """
+    Custom extraction, fallback method with multiple strategies
+    Runs on the parsed lxml tree; the name is kept so per-domain stats carry over
+    """
+    root = _own_tree(html, tree)
+
+    # Remove unwanted elements
+    for element in root.xpath(_FALLBACK_DROP_XPATH):
+        if element.getparent() is not None:
+            element.drop_tree()
+
+    # Remove ads and widgets
+    for element in root.xpath('//*[@class]'):
+        classes = element.get('class', '').lower()
+        if element.getparent() is not None and any(name in classes for name in _FALLBACK_DROP_CLASSES):
+            element.drop_tree()
+
+    text = None
+
+    # Try article tag
+    article = root.find('.//article')
+    if article is not None:
+        text = _paragraph_text(article)
+
+    # Try main tag
+    if not text or len(text) < 300:
+        main = root.find('.//main')
+        if main is not None:
+            text = _paragraph_text(main)
+
+    # Try content divs
+    if not text or len(text) < 300:
+        for div in root.xpath('//div[@class]'):
+            if not _CONTENT_CLASS.search(div.get('class')):
+                continue
+            temp_text = _paragraph_text(div)
+            if len(temp_text) > len(text or ''):
+                text = temp_text
+
+    # Try all paragraphs as last resort
+    if not text or len(text) < 300:
+        text = _paragraph_text(root, min_length=50)
+
+    if text:
+        text = clean_text(text)
+        if len(text) > 300:
+            return text
+
+    return None
+
+
+# Strategy name -> function(url, html, tree=None); tree is a parsed page the strategy may modify.
+# Module level so a process pool can run them
+STRATEGIES = {
+    'newspaper3k': extract_with_newspaper,        # Best for news sites
+    'trafilatura': extract_with_trafilatura,      # Excellent for general articles
+    'readability': extract_with_readability,      # Good for complex layouts
+    'beautifulsoup': extract_with_beautifulsoup,  # Custom fallback
+}
+# Strategies that work on (and modify) a parsed tree; newspaper3k parses markup itself
+TREE_STRATEGIES = frozenset({'trafilatura', 'readability', 'beautifulsoup'})
+
+
+def _limit_worker_memory(limit_mb):
+    """Pool initializer: cap a worker's address space so a runaway parse raises MemoryError"""
+    try:
+        import resource
+        limit = limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass  # Not supported on this platform; workers are still recycled by task count
+
+
+def _run_isolated(method, url, html):
+    """Worker entry point: (content, error name, seconds) so failures cross the process boundary cleanly"""
+    start = time.monotonic()
+    try:
+        return STRATEGIES[method](url, html), None, time.monotonic() - start
+    except MemoryError:
+        return None, 'MemoryError', time.monotonic() - start
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.monotonic() - start
 
 
 class ArticleExtractor:
@@ -19,240 +293,362 @@ class ArticleExtractor:
     """
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = get_session()
+        # Browser-like headers for news sites, sent per request over the shared pool
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
-        })
+        }
+        self.strategies = STRATEGIES
+        self.workers = EXTRACTION_WORKERS
+        self._pool = None
+        self._other_children = set()  # PIDs of child processes that are not pool workers
+        self._stragglers = []  # (future, deadline) of strategies left running after a winner
+    
+    def _fetch(self, url, timeout=20, namespace='page'):
+        """Download the page once (or reuse the cached copy); every strategy parses the same bytes"""
+        return fetch_page(url, session=self.session, timeout=timeout, namespace=namespace, headers=self.headers)
     
     def extract(self, url):
         """
         Extract full article using multiple strategies
-        Returns the longest/best extraction
+        
+        Cheap paths come first: the page's JSON-LD articleBody, then the site profile's
+        selectors; either is used when it passes EXTRACTION_QUALITY_THRESHOLD.
+        
+        cascade: run strategies in EXTRACTION_CASCADE order, stop at the first result
+                 scoring EXTRACTION_QUALITY_THRESHOLD or better, else keep the best score
+        thorough: run every strategy and keep the longest extraction
+        parallel: run every strategy at once in worker processes, bounded by the deadline
+        
+        All modes stop starting new work after EXTRACTION_DEADLINE_SECONDS (download included).
+        A lighter page variant gets a capped share of that (EXTRACTION_VARIANT_SECONDS); the
+        canonical page always keeps the rest, and its attempts are recorded as 'lite:<method>'.
+        Cascade and parallel modes use per-domain history: the usual winner runs first and
+        strategies that never work on the domain are only tried if nothing else did.
         """
         logger.info(f"Extracting article from: {url}")
+        cached = get_extracted_text(url, EXTRACTOR_VERSION)
+        if cached:
+            logger.info(f"♻️ Using cached extraction: {len(cached)} chars")
+            return cached
+        
+        start = time.monotonic()
+        deadline = start + EXTRACTION_DEADLINE_SECONDS
+        domain = domain_of(url)
+        attempts = []  # (method, succeeded, seconds) for the per-domain stats
+        
+        # Lighter AMP/lite page first when the domain has one; the canonical page if it falls short
+        lite_url = variant_url(url) if EXTRACTION_PAGE_VARIANTS else None
+        best = None
+        if lite_url:
+            budget = min(EXTRACTION_DEADLINE_SECONDS / 3, EXTRACTION_VARIANT_SECONDS)
+            best = self._extract_variant(url, lite_url, domain, start + budget, attempts)
+            # A slow variant must not eat into the canonical page's share
+            deadline = max(deadline, time.monotonic() + EXTRACTION_DEADLINE_SECONDS - budget)
+        
+        if best is None:
+            try:
+                resp = self._fetch(url, timeout=self._time_left(deadline))
+            except Exception as e:
+                logger.warning(f"❌ Could not download {url}: {e}")
+                failure = classify_error(e)
+                if failure:
+                    record_block(url, failure)
+                record_extraction(domain, attempts, None, time.monotonic() - start)
+                return None
+            html = resp.content
+            if not resp.from_cache:
+                logger.info(f"📦 Downloaded {len(html) / 1024:.0f}KB page")
+                record_page_download(domain, False, len(html))
+                if EXTRACTION_PAGE_VARIANTS:
+                    learn_variant(url, html)
+            
+            # Structured data first: pages that embed their article body need no DOM at all
+            best = self._extract_json_ld(url, html, attempts) if EXTRACTION_JSON_LD else None
+            if best is None:
+                best = self._extract_dom(url, html, domain, deadline, attempts)
+            if best is None:
+                failure = classify_page(resp.url, html)  # Consent wall or paywall instead of an article
+                if failure:
+                    record_block(url, failure)
+        
+        winner = best[0] if best else None
+        record_extraction(domain, attempts, winner, time.monotonic() - start)
+        if best:
+            text = strip_boilerplate(url, best[1])
+            save_extracted_text(url, EXTRACTOR_VERSION, text)
+            return text
         
-        results = []
-        
-        # Strategy 1: newspaper3k (best for news sites)
+        logger.warning(f"❌ All extraction methods failed for {url}")
+        return None
+    
+    def _extract_serial(self, url, html, shared, deadline, order, attempts):
+        """Cascade/thorough in this process on a SharedTree; returns (method, content) or None"""
+        thorough = EXTRACTION_MODE == 'thorough'
+        results = []  # (method, content, score)
+        
+        for position, method in enumerate(order):
+            if time.monotonic() > deadline:
+                logger.warning(f"⏱️ Extraction deadline reached, {len(order) - position} strategies not run")
+                break
+            started = time.monotonic()
+            content = self._run_strategy(method, url, html, shared.take() if method in TREE_STRATEGIES else None)
+            attempts.append((method, bool(content), time.monotonic() - started))
+            if not content:
+                continue
+            score = score_extraction(content)
+            results.append((method, content, score))
+            logger.info(f"{method} extracted: {len(content)} chars (quality {score:.2f})")
+            
+            if not thorough and score >= EXTRACTION_QUALITY_THRESHOLD:
+                skipped = self._skipped(attempts)
+                logger.info(f"✅ Best extraction: {method} with {len(content)} chars "
+                            f"(passed quality threshold, {skipped} strategies skipped)")
+                return method, content
+        
+        if not results:
+            return None
+        if thorough:
+            # Return the longest extraction (usually the most complete)
+            best_method, best_content, best_score = max(results, key=lambda x: len(x[1]))
+        else:
+            best_method, best_content, best_score = max(results, key=lambda x: x[2])
+        logger.info(f"✅ Best extraction: {best_method} with {len(best_content)} chars "
+                    f"(quality {best_score:.2f}, {self._skipped(attempts)} strategies skipped)")
+        return best_method, best_content
+    
+    def _extract_json_ld(self, url, html, attempts):
+        """JSON-LD articleBody fast path; (method, content) if it passes the quality threshold, else None"""
+        started = time.monotonic()
         try:
-            content = self._extract_with_newspaper(url)
-            if content:
-                results.append(('newspaper3k', content))
-                logger.info(f"newspaper3k extracted: {len(content)} chars")
+            article = find_article(html)
         except Exception as e:
-            logger.debug(f"newspaper3k failed: {e}")
+            logger.debug(f"JSON-LD lookup failed for {url}: {e}")
+            article = None
+        content = None
+        if article:
+            content = article['body']
+            if article['headline'] and article['headline'] not in content:
+                content = f"{article['headline']}\n\n{content}"
+            content = clean_text(content)
+        score = score_extraction(content)
+        passed = score >= EXTRACTION_QUALITY_THRESHOLD
+        attempts.append(('json_ld', passed, time.monotonic() - started))
+        if not passed:
+            if article:
+                logger.info(f"JSON-LD article body too thin (quality {score:.2f}), parsing the page")
+            return None
+        save_page_meta(url, {'image': article['image'], 'published': article['published']})
+        logger.info(f"✅ JSON-LD extracted: {len(content)} chars (quality {score:.2f}), page not parsed")
+        return 'json_ld', content
+    
+    @staticmethod
+    def _time_left(deadline):
+        """Download timeout that ends at the deadline (at least a second, at most 20)"""
+        return min(20, max(1, deadline - time.monotonic()))
+    
+    def _extract_variant(self, url, lite_url, domain, deadline, attempts):
+        """
+        Extract from the lighter page variant; (method, content) only if it passes the quality threshold
         
-        # Strategy 2: trafilatura (excellent for general articles)
+        Attempts are recorded as 'lite:<method>', so the variant's results never reorder
+        the domain's canonical strategies in plan_strategies.
+        """
         try:
-            content = self._extract_with_trafilatura(url)
-            if content:
-                results.append(('trafilatura', content))
-                logger.info(f"trafilatura extracted: {len(content)} chars")
+            resp = self._fetch(lite_url, timeout=self._time_left(deadline), namespace='lite')
         except Exception as e:
-            logger.debug(f"trafilatura failed: {e}")
+            logger.info(f"Lighter variant unavailable ({e}), using the canonical page")
+            record_page_download(domain, True, 0, usable=False)
+            return None
         
-        # Strategy 3: readability (good for complex layouts)
+        html = resp.content
+        tried = []
+        best = self._extract_json_ld(url, html, tried) if EXTRACTION_JSON_LD else None
+        if best is None:
+            # Site profiles describe the canonical markup, so only the generic strategies run here
+            best = self._extract_dom(url, html, domain, deadline, tried, use_profile=False)
+        attempts.extend((f'lite:{method}', ok, seconds) for method, ok, seconds in tried)
+        usable = best is not None and score_extraction(best[1]) >= EXTRACTION_QUALITY_THRESHOLD
+        record_page_download(domain, True, 0 if resp.from_cache else len(html), usable)
+        if not usable:
+            logger.info(f"Lighter variant {lite_url} fell short, using the canonical page")
+            return None
+        logger.info(f"📦 Extracted from lighter variant ({len(html) / 1024:.0f}KB): {lite_url}")
+        return f'lite:{best[0]}', best[1]
+    
+    def _extract_dom(self, url, html, domain, deadline, attempts, use_profile=True):
+        """Site profile, then the generic strategies, on one parsed tree; (method, content) or None"""
+        # Parse once: og:image discovery and the in-process strategies share this tree
         try:
-            content = self._extract_with_readability(url)
-            if content:
-                results.append(('readability', content))
-                logger.info(f"readability extracted: {len(content)} chars")
+            tree = parse_html(html)
         except Exception as e:
-            logger.debug(f"readability failed: {e}")
-        
-        # Strategy 4: Custom BeautifulSoup (fallback)
+            logger.debug(f"Could not parse {url} with lxml, strategies will parse on their own: {e}")
+            tree = None
+        if tree is not None:
+            save_page_meta(url, {'image': find_page_image(tree)})
+        
+        # Known site: its selectors on the shared tree, generic strategies only if that falls short
+        profile = profile_for(url) if use_profile and EXTRACTION_SITE_PROFILES and tree is not None else None
+        best = self._extract_profile(profile, tree, attempts) if profile else None
+        if best is not None:
+            return best
+        
+        if EXTRACTION_MODE == 'thorough':
+            order, fallback = list(self.strategies), []
+        else:
+            order, fallback = plan_strategies(domain, EXTRACTION_CASCADE)
+        
+        if EXTRACTION_MODE == 'parallel':
+            best = self._extract_parallel(url, html, deadline, order, attempts)
+            if best is None and fallback and time.monotonic() < deadline:
+                logger.info(f"Trying strategies that usually fail on {domain}: {', '.join(fallback)}")
+                best = self._extract_parallel(url, html, deadline, fallback, attempts)
+        else:
+            shared = SharedTree(tree)
+            best = self._extract_serial(url, html, shared, deadline, order, attempts)
+            if best is None and fallback and time.monotonic() < deadline:
+                logger.info(f"Trying strategies that usually fail on {domain}: {', '.join(fallback)}")
+                best = self._extract_serial(url, html, shared, deadline, fallback, attempts)
+        return best
+    
+    def _extract_profile(self, profile, tree, attempts):
+        """Site-profile fast path; (method, content) if it passes the quality threshold, else None"""
+        started = time.monotonic()
         try:
-            content = self._extract_with_beautifulsoup(url)
-            if content:
-                results.append(('beautifulsoup', content))
-                logger.info(f"beautifulsoup extracted: {len(content)} chars")
+            content = clean_text(profile.extract(tree))
         except Exception as e:
-            logger.debug(f"beautifulsoup failed: {e}")
-        
-        # Return the longest extraction (usually the most complete)
-        if results:
-            best_method, best_content = max(results, key=lambda x: len(x[1]))
-            logger.info(f"✅ Best extraction: {best_method} with {len(best_content)} chars")
-            return best_content
-        
-        logger.warning(f"❌ All extraction methods failed for {url}")
+            logger.debug(f"Site profile {profile.name} failed: {e}")
+            content = None
+        score = score_extraction(content)
+        passed = score >= EXTRACTION_QUALITY_THRESHOLD
+        attempts.append(('site_profile', passed, time.monotonic() - started))
+        if passed:
+            logger.info(f"✅ Site profile {profile.name} extracted: {len(content)} chars (quality {score:.2f})")
+            return 'site_profile', content
+        logger.info(f"Site profile {profile.name} fell short (quality {score:.2f}), trying generic strategies")
         return None
     
-    def _extract_with_newspaper(self, url):
-        """
-        Extract using newspaper3k library
-        Excellent for news sites, handles JavaScript
-        """
-        article = Article(url)
-        article.download()
-        article.parse()
-        
-        # Get full text
-        text = article.text
-        
-        # Add title if not in text
-        if article.title and article.title not in text:
-            text = f"{article.title}\n\n{text}"
-        
-        # Clean and validate
-        text = self._clean_text(text)
-        
-        if len(text) > 300:
-            return text
-        return None
+    def _skipped(self, attempts):
+        """Generic strategies not run for this URL"""
+        return len(self.strategies) - sum(1 for method, _, _ in attempts if method in self.strategies)
     
-    def _extract_with_trafilatura(self, url):
-        """
-        Extract using trafilatura library
-        Excellent for general articles, very accurate
-        """
-        # Download page
-        downloaded = trafilatura.fetch_url(url)
-        if not downloaded:
+    def _run_strategy(self, method, url, html, tree=None):
+        """Run one named strategy, never raising"""
+        try:
+            return self.strategies[method](url, html, tree)
+        except Exception as e:
+            logger.debug(f"{method} failed: {e}")
             return None
-        
-        # Extract with all features enabled
-        text = trafilatura.extract(
-            downloaded,
-            include_comments=False,
-            include_tables=True,
-            no_fallback=False,
-            favor_precision=False,  # Favor recall to get more content
-            favor_recall=True
-        )
-        
-        if text:
-            text = self._clean_text(text)
-            if len(text) > 300:
-                return text
-        
-        return None
     
-    def _extract_with_readability(self, url):
-        """
-        Extract using readability-lxml
-        Good for complex layouts and paywalls
-        """
-        response = self.session.get(url, timeout=20)
-        response.raise_for_status()
-        
-        # Use readability to extract main content
-        doc = Document(response.content)
-        html_content = doc.summary()
-        
-        # Parse HTML to text
-        soup = BeautifulSoup(html_content, 'lxml')
-        
-        # Remove unwanted elements
-        for tag in soup(['script', 'style', 'nav', 'footer', 'aside']):
-            tag.decompose()
-        
-        # Get text from paragraphs
-        paragraphs = soup.find_all('p')
-        text = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 30])
-        
-        # Add title if available
-        title = doc.title()
-        if title and title not in text:
-            text = f"{title}\n\n{text}"
-        
-        text = self._clean_text(text)
-        
-        if len(text) > 300:
-            return text
-        return None
+    def _get_pool(self):
+        """Worker processes, created on first use"""
+        if self._pool is None:
+            self._other_children = {process.pid for process in multiprocessing.active_children()}
+            # spawn: max_tasks_per_child is not supported with fork
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_limit_worker_memory,
+                initargs=(EXTRACTION_WORKER_MEMORY_MB,),
+                max_tasks_per_child=EXTRACTION_MAX_TASKS_PER_CHILD,
+            )
+        return self._pool
     
-    def _extract_with_beautifulsoup(self, url):
-        """
-        Custom extraction using BeautifulSoup
-        Fallback method with multiple strategies
+    def _recycle_pool(self, reason):
+        """Kill the workers (and whatever they are still running); a fresh pool starts on next use"""
+        pool, self._pool = self._pool, None
+        self._stragglers = []
+        if pool is None:
+            return
+        # Children started since the pool was created are its workers (recycled ones included)
+        workers = [process for process in multiprocessing.active_children() if process.pid not in self._other_children]
+        logger.warning(f"♻️ Recycling extraction workers ({len(workers)} of {self.workers} running): {reason}")
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+    
+    def _extract_parallel(self, url, html, deadline, order, attempts):
         """
-        response = self.session.get(url, timeout=20)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Remove unwanted elements
-        for tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'header', 'iframe']):
-            tag.decompose()
-        
-        # Remove ads and widgets
-        for class_name in ['ad', 'advertisement', 'social', 'related', 'comments', 'sidebar']:
-            for tag in soup.find_all(class_=lambda x: x and class_name in str(x).lower()):
-                tag.decompose()
-        
-        text = None
-        
-        # Try article tag
-        article = soup.find('article')
-        if article:
-            paragraphs = article.find_all('p')
-            text = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 30])
-        
-        # Try main tag
-        if not text or len(text) < 300:
-            main = soup.find('main')
-            if main:
-                paragraphs = main.find_all('p')
-                text = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 30])
-        
-        # Try content divs
-        if not text or len(text) < 300:
-            content_divs = soup.find_all('div', class_=re.compile(r'(content|article|story|post)', re.I))
-            for div in content_divs:
-                paragraphs = div.find_all('p')
-                temp_text = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 30])
-                if len(temp_text) > len(text or ''):
-                    text = temp_text
+        Run strategies concurrently in the process pool; returns (method, content) or None
         
-        # Try all paragraphs as last resort
-        if not text or len(text) < 300:
-            all_paragraphs = soup.find_all('p')
-            text = '\n\n'.join([p.get_text().strip() for p in all_paragraphs if len(p.get_text().strip()) > 50])
-        
-        if text:
-            text = self._clean_text(text)
-            if len(text) > 300:
-                return text
+        Returns the first result passing the quality threshold, otherwise the best result
+        available at the deadline. Queued losers are cancelled; workers still busy past
+        the deadline are recycled.
+        """
+        # Losers of the previous article that are still running past their own deadline
+        now = time.monotonic()
+        if any(not future.done() and now > straggler_deadline for future, straggler_deadline in self._stragglers):
+            self._recycle_pool("strategies from a previous article overran their deadline")
+        self._stragglers = [(f, d) for f, d in self._stragglers if not f.done()]
         
-        return None
-    
-    def _clean_text(self, text):
-        """Clean extracted text"""
-        if not text:
+        submitted = time.monotonic()
+        try:
+            pool = self._get_pool()
+            futures = {pool.submit(_run_isolated, method, url, html): method for method in order}
+        except Exception as e:
+            self._recycle_pool(f"pool unavailable ({e})")
             return None
         
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        
-        # Remove common boilerplate
-        boilerplate_patterns = [
-            r'Click here to.*?(?=\n|$)',
-            r'Read more:.*?(?=\n|$)',
-            r'Subscribe to.*?(?=\n|$)',
-            r'Follow us on.*?(?=\n|$)',
-            r'Sign up for.*?(?=\n|$)',
-            r'Advertisement\s*',
-            r'ADVERTISEMENT\s*',
-        ]
-        
-        for pattern in boilerplate_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-        
-        # Remove URLs
-        text = re.sub(r'http[s]?://\S+', '', text)
-        
-        # Clean up spacing
-        text = text.strip()
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        
-        return text
+        results = []  # (method, content, score)
+        winner = None
+        recycle_reason = None
+        pending = set(futures)
+        
+        while pending and winner is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                method = futures[future]
+                try:
+                    content, error, elapsed = future.result()
+                except Exception as e:  # BrokenProcessPool: a worker died (e.g. killed over the memory limit)
+                    recycle_reason = f"{method} worker died ({type(e).__name__})"
+                    attempts.append((method, False, time.monotonic() - submitted))
+                    continue
+                attempts.append((method, bool(content), elapsed))
+                if error:
+                    logger.debug(f"{method} failed: {error}")
+                    if error == 'MemoryError':
+                        recycle_reason = f"{method} hit the {EXTRACTION_WORKER_MEMORY_MB}MB memory limit"
+                    continue
+                if not content:
+                    continue
+                score = score_extraction(content)
+                results.append((method, content, score))
+                logger.info(f"{method} extracted: {len(content)} chars (quality {score:.2f})")
+                if score >= EXTRACTION_QUALITY_THRESHOLD and (winner is None or score > winner[2]):
+                    winner = (method, content, score)
+        
+        cancelled = sum(1 for future in pending if future.cancel())
+        running = [future for future in pending if not future.cancelled()]
+        if recycle_reason:
+            self._recycle_pool(recycle_reason)
+        elif running and winner is None:
+            # Deadline hit: nothing else to wait for, don't let overdue work hold the workers
+            self._recycle_pool(f"{len(running)} strategies overdue after {EXTRACTION_DEADLINE_SECONDS}s")
+            attempts.extend((futures[future], False, time.monotonic() - submitted) for future in running)
+        elif running:
+            self._stragglers.extend((future, deadline) for future in running)
+        
+        best = winner or (max(results, key=lambda x: x[2]) if results else None)
+        if not best:
+            return None
+        method, content, score = best
+        logger.info(f"✅ Best extraction: {method} with {len(content)} chars (quality {score:.2f}, "
+                    f"{cancelled} strategies cancelled, {len(running)} abandoned)")
+        return method, content
+    
+    def close(self):
+        """Shut down the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
 
 
 # Global instance
@@ -263,6 +659,7 @@ def get_extractor():
     global _extractor
     if _extractor is None:
         _extractor = ArticleExtractor()
+        atexit.register(_extractor.close)
     return _extractor
 
 
@@ -279,3 +676,99 @@ def extract_article(url):
     """
     extractor = get_extractor()
     return extractor.extract(url)
+
+
+def extract_feed_content(url, content):
+    """
+    Article text from a feed's full-text payload (content:encoded / Atom content)
+    
+    Args:
+        url: Article URL (for the per-domain stats)
+        content: Feed entry content, usually HTML
+    
+    Returns:
+        str: Cleaned text if it is a complete article (FEED_FULL_TEXT_MIN_CHARS and the
+             quality threshold), so the page need not be downloaded
+        None: No usable full text in the feed
+    """
+    if not content:
+        return None
+    start = time.monotonic()
+    try:
+        container = lxml.html.fragment_fromstring(content, create_parent='div')
+        text = clean_text(_paragraph_text(container, min_length=0) or container.text_content())
+    except Exception as e:
+        logger.debug(f"Could not read feed content for {url}: {e}")
+        text = None
+    score = score_extraction(text)
+    passed = bool(text) and len(text) >= FEED_FULL_TEXT_MIN_CHARS and score >= EXTRACTION_QUALITY_THRESHOLD
+    if not passed:
+        logger.info(f"Feed content not a full article ({len(text or '')} chars, quality {score:.2f}), scraping the page")
+        return None
+    # Failures are not recorded: the page extraction that follows counts for the domain
+    elapsed = time.monotonic() - start
+    record_extraction(domain_of(url), [('feed_content', True, elapsed)], 'feed_content', elapsed)
+    logger.info(f"✅ Using full text from the feed: {len(text)} chars (quality {score:.2f}), page not downloaded")
+    return strip_boilerplate(url, text)
+
+
+def _benchmark_page(html, shared, methods):
+    """Run strategies plus og:image discovery on one page; (CPU seconds, peak RSS growth KB)"""
+    import resource
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.process_time()
+    if shared:
+        tree = SharedTree(parse_html(html))
+        find_page_image(tree.tree)
+    else:
+        tree = None
+        find_page_image(parse_html(html))  # Image discovery parsed the page separately
+    for method in methods:
+        try:
+            STRATEGIES[method]('https://example.com/sport/story', html,
+                               tree.take() if tree and method in TREE_STRATEGIES else None)
+        except Exception as e:
+            print(f"    {method} failed: {e}")
+    return time.process_time() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+
+# Benchmark: CPU time and peak memory per article, one parse per consumer vs one shared tree
+# Usage: python src/article_extractor.py [page.html ...]  (synthetic article page if no files given)
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        pages = []
+        for path in sys.argv[1:]:
+            with open(path, 'rb') as f:
+                pages.append((path, f.read()))
+    else:
+        # Distinct paragraphs: trafilatura drops repeated ones
+        paragraphs = [f'<p>The striker scored twice in the second half of match {i} as the hosts came from behind '
+                      f'to win the derby and move {i % 5 + 1} points clear at the top of the table.</p>' for i in range(50)]
+        chrome = ''.join(f'<li><a href="/sport/{i}">Section {i}</a></li>' for i in range(300))
+        script = '<script>var config = {' + ','.join(f'"k{i}": {i}' for i in range(3000)) + '};</script>'
+        page = (f'<html><head><title>Late winner seals derby</title>'
+                f'<meta property="og:image" content="https://example.com/img.jpg">{script}</head>'
+                f'<body><header><nav><ul>{chrome}</ul></nav></header><main><article><h1>Late winner seals derby</h1>'
+                f'{"".join(paragraphs[:40])}</article><aside class="sidebar related">{"".join(paragraphs[40:])}</aside></main>'
+                f'<footer><ul>{chrome}</ul></footer></body></html>')
+        pages = [('synthetic article page', page.encode())]
+
+    # The usual cascade stops at its first strategy; the worst case runs all of them
+    scenarios = (('cascade, first strategy wins', EXTRACTION_CASCADE[:1]), ('all strategies', EXTRACTION_CASCADE))
+    runs_per_case = 5
+    context = multiprocessing.get_context('spawn')
+    for name, html in pages:
+        print(f"\n{name}: {len(html) / 1024:.0f}KB, og:image + strategies, {runs_per_case} runs each")
+        for scenario, methods in scenarios:
+            print(f"  {scenario}")
+            for label, shared in (('one parse per consumer', False), ('shared tree', True)):
+                runs = []
+                for _ in range(runs_per_case):
+                    # Fresh worker per run so peak RSS is not inherited from the previous one
+                    with context.Pool(1) as pool:
+                        runs.append(pool.apply(_benchmark_page, (html, shared, methods)))
+                cpu = sum(run[0] for run in runs) / len(runs)
+                peak = max(run[1] for run in runs)
+                print(f"    {label:<24} {cpu * 1000:8.1f} ms CPU  peak RSS +{peak / 1024:6.1f}MB")
@@ -0,0 +1,84 @@
+"""
+Learned Boilerplate Paragraphs
+Every page of a site carries the same promo, newsletter and "follow us" paragraphs.
+Each extracted page's paragraphs are fingerprinted and counted once per canonical
+URL and domain; paragraphs that show up on many distinct pages of a domain are
+dropped from later extractions with a set lookup per paragraph, before the text is
+used as prompt material.
+
+Run `python src/boilerplate.py` for the number of learned paragraphs per domain.
+"""
+
+import re
+import hashlib
+import threading
+from utils import logger, record_paragraph_fingerprints, get_boilerplate_fingerprints, get_fingerprint_domains
+from extraction_stats import domain_of
+from url_canonical import canonicalize_url
+from config import BOILERPLATE_LEARNING, BOILERPLATE_MIN_PAGES, BOILERPLATE_MIN_SHARE
+
+_DIGITS = re.compile(r'\d+')
+
+# domain -> learned fingerprints, loaded once per run and refreshed after learning
+_known = {}
+_known_lock = threading.Lock()
+
+
+def fingerprint(paragraph):
+    """Stable hash of a paragraph, ignoring case, spacing and numbers (dates, counts)"""
+    normalized = _DIGITS.sub('0', ' '.join(paragraph.lower().split()))
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _boilerplate_for(domain):
+    with _known_lock:
+        if domain not in _known:
+            _known[domain] = get_boilerplate_fingerprints(domain, BOILERPLATE_MIN_PAGES, BOILERPLATE_MIN_SHARE)
+        return _known[domain]
+
+
+def strip_boilerplate(url, text):
+    """
+    Drop the domain's learned boilerplate paragraphs from extracted text, then learn from it
+
+    Counts mean distinct pages: a URL extracted again on a later run is stripped but not
+    counted again, so an article's own paragraphs never become its domain's boilerplate.
+    """
+    if not BOILERPLATE_LEARNING or not text:
+        return text
+    domain = domain_of(url)
+    paragraphs = [p for p in text.split('\n\n') if p.strip()]
+    prints = [fingerprint(p) for p in paragraphs]
+    known = _boilerplate_for(domain)
+
+    kept = [p for p, fp in zip(paragraphs, prints) if fp not in known]
+    try:
+        learned = record_paragraph_fingerprints(domain, canonicalize_url(url), set(prints))
+    except Exception as e:
+        logger.debug(f"Could not record paragraph fingerprints for {domain}: {e}")
+        learned = False
+    if learned:
+        with _known_lock:
+            _known.pop(domain, None)
+
+    if not kept:
+        return text  # Never strip a page to nothing: the fingerprints are off, not the article
+    if len(kept) < len(paragraphs):
+        removed = sum(len(p) for p in paragraphs) - sum(len(p) for p in kept)
+        logger.info(f"🧹 Stripped {len(paragraphs) - len(kept)} boilerplate paragraphs ({removed} chars) for {domain}")
+    return '\n\n'.join(kept)
+
+
+def print_report():
+    """Print fingerprinted pages and learned boilerplate paragraphs per domain"""
+    print(f"{'Domain':<32} {'Pages':>6} {'Boilerplate paragraphs':>23}")
+    for domain, pages in sorted(get_fingerprint_domains().items(), key=lambda item: item[1], reverse=True):
+        learned = get_boilerplate_fingerprints(domain, BOILERPLATE_MIN_PAGES, BOILERPLATE_MIN_SHARE)
+        print(f"{domain[:32]:<32} {pages:>6} {len(learned):>23}")
+
+
+if __name__ == "__main__":
+    from utils import init_database
+
+    init_database()
+    print_report()
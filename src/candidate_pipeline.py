@@ -0,0 +1,207 @@
+"""
+Streaming Candidate Pipeline
+fetch -> parse -> dedup -> score generators feeding a bounded top-K heap.
+
+Only the K best candidates are ever kept, so memory stays O(K) however many
+entries the feeds carry, and MinHash signatures are computed only for entries
+good enough to enter the heap.
+"""
+
+import heapq
+from utils import logger, filter_unseen
+from url_canonical import article_urls
+from story_dedup import compute_signature, signature_to_bytes, similarity
+from extraction_stats import domain_of
+from config import DOMAIN_BLOCK_PENALTY
+
+MIN_PRIORITY = 3  # Skip low-priority sports (American football, etc.)
+
+
+class Candidate:
+    """Compact record for one feed entry that survived dedup and scoring"""
+
+    __slots__ = ('title', 'link', 'key', 'summary', 'content', 'source', 'priority', 'order', 'signature',
+                 'feed_url', 'entry_id')
+
+    def __init__(self, title, link, summary, source, priority, order, content='', feed_url=None, entry_id=None,
+                 key=None):
+        self.title = title
+        self.link = link  # URL to fetch and credit: the feed link, or its redirect target
+        self.key = key or link  # Canonical URL: the dedup key stored once the article is published
+        self.summary = summary
+        self.content = content  # Full-text payload the feed shipped with the entry, if any
+        self.source = source
+        self.priority = priority
+        self.order = order  # Arrival position: feed order, then entry order
+        self.signature = None
+        self.feed_url = feed_url  # Feed and entry id, to settle the entry once it is published
+        self.entry_id = entry_id
+
+    @property
+    def rank_key(self):
+        """Higher is better; earlier arrival wins ties, like the old stable sort"""
+        return (self.priority, -self.order)
+
+
+class PipelineStats:
+    """Counters for the RSS Summary log line, plus the entries settled for the feed watermarks"""
+
+    __slots__ = ('fetched', 'unchanged', 'failed', 'duplicates', 'filtered', 'candidates', 'blocked', 'per_feed',
+                 'settled', 'unchanged_feeds')
+
+    def __init__(self):
+        self.fetched = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.filtered = 0
+        self.candidates = 0
+        self.blocked = 0  # Entries from domains with an active scraping block (ranked lower)
+        self.per_feed = {}  # feed_url -> new priority-passing entries (feed yield)
+        self.unchanged_feeds = set()  # Feeds re-read from their cached body: their entries are not new
+        self.settled = {}  # feed_url -> ids of entries that need no further look (feed_fetcher.save_watermarks)
+
+    def settle(self, feed_url, entry_id):
+        """Record an entry as processed, published or filtered out for good"""
+        if entry_id:
+            self.settled.setdefault(feed_url, set()).add(entry_id)
+
+
+def iter_feed_batches(results, stats):
+    """Parse stage: yield (feed_url, source, entries) for every feed that returned new content"""
+    for result in results:
+        if not result.ok:
+            stats.failed += 1
+            logger.error(f"Failed to fetch RSS {result.feed_url}: {result.error}")
+            continue
+
+        # Unchanged since last run, but only the top entries were processed then:
+        # the rest are offered again (dedup drops the processed ones)
+        entries = result.feed.entries
+        if result.not_modified:
+            stats.unchanged += 1
+            stats.unchanged_feeds.add(result.feed_url)
+            logger.info(f"Feed unchanged since last run: {result.feed_url} ({len(entries)} entries, {result.elapsed:.2f}s)")
+        else:
+            stats.fetched += len(entries)
+            logger.info(f"Fetched {len(entries)} articles from {result.feed_url} in {result.elapsed:.2f}s")
+        yield result.feed_url, result.feed.feed.get('title', 'Unknown'), entries
+
+
+def iter_unseen(batches, stats):
+    """
+    Dedup stage: one lookup per feed batch, yield (feed_url, source, entry, link, key) for new links only
+
+    `link` is the URL to fetch, `key` the canonical URL. Older rows were keyed by the
+    raw feed link, so an entry counts as new only if neither its raw nor its canonical
+    URL was processed.
+    """
+    seen_keys = set()  # Canonical URLs already yielded this run (same story in several feeds)
+    for feed_url, source, entries in batches:
+        links = [(entry, entry.get('link')) + article_urls(entry.get('link')) for entry in entries]
+        unseen = set(filter_unseen(url for _, raw, _, key in links for url in (raw, key)))
+        for entry, raw, link, key in links:
+            if raw in unseen and key in unseen and key not in seen_keys:
+                seen_keys.add(key)
+                yield feed_url, source, entry, link, key
+            else:
+                stats.duplicates += 1
+                if raw not in unseen or key not in unseen:
+                    stats.settle(feed_url, entry.get('id'))  # Already processed
+
+
+def iter_scored(entries, score, stats, min_priority=MIN_PRIORITY, blocks=None):
+    """
+    Score stage: yield Candidate records at or above min_priority
+
+    Entries from domains in `blocks` (domain_blocks.active_blocks()) lose
+    DOMAIN_BLOCK_PENALTY points: they can only be written from the RSS summary.
+    """
+    for order, (feed_url, source, entry, link, key) in enumerate(entries):
+        title = entry.get('title', '')
+        summary = entry.get('summary', '')
+        priority = score(title, summary)
+        blocked = blocks and domain_of(link) in blocks
+        if blocked:
+            stats.blocked += 1
+            priority -= DOMAIN_BLOCK_PENALTY
+
+        if priority < min_priority:
+            stats.filtered += 1
+            if not blocked:
+                stats.settle(feed_url, entry.get('id'))  # Blocks expire; low scores do not
+            logger.debug(f"Filtered low priority ({priority}): {title[:50]}")
+            continue
+
+        stats.candidates += 1
+        if feed_url not in stats.unchanged_feeds:  # Entries offered again are no yield
+            stats.per_feed[feed_url] = stats.per_feed.get(feed_url, 0) + 1
+        yield Candidate(title, link, summary, source, priority, order, entry.get('content', ''),
+                        feed_url, entry.get('id'), key)
+
+
+class TopKSelector:
+    """
+    Bounded min-heap of the K best candidates, with near-duplicate collapsing
+
+    A candidate matching a recently published story is dropped; one matching a
+    candidate already in the heap replaces it only if it ranks higher.
+    """
+
+    def __init__(self, k, deduplicator):
+        self.k = max(1, k)
+        self.deduplicator = deduplicator
+        self.heap = []  # (rank_key, candidate); heap[0] is the weakest kept candidate
+        self.saved_calls = 0  # Duplicates that would otherwise have been selected
+        self.repeats = []  # Candidates dropped as repeats of recently published stories
+
+    def _qualifies(self, candidate):
+        return len(self.heap) < self.k or candidate.rank_key > self.heap[0][0]
+
+    def offer(self, candidate):
+        if not self._qualifies(candidate):
+            return
+
+        signature = compute_signature(candidate.title, candidate.summary)
+        if signature is not None:
+            if self.deduplicator.matches_recent(candidate.title, signature):
+                self.saved_calls += 1
+                self.repeats.append(candidate)
+                return
+
+            for i, (key, kept) in enumerate(self.heap):
+                kept_signature = kept.signature
+                if kept_signature is None or similarity(signature, kept_signature) < self.deduplicator.threshold:
+                    continue
+                self.deduplicator.collapsed += 1
+                self.saved_calls += 1
+                if candidate.rank_key > key:
+                    candidate.signature = signature
+                    self.heap[i] = (candidate.rank_key, candidate)
+                    heapq.heapify(self.heap)
+                logger.debug(f"Near-duplicate: {candidate.title[:50]} ~ {kept.title[:50]}")
+                return
+
+        candidate.signature = signature
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (candidate.rank_key, candidate))
+        else:
+            heapq.heapreplace(self.heap, (candidate.rank_key, candidate))
+
+    def results(self):
+        """Selected candidates, best first, with signatures serialized for storage"""
+        selected = [candidate for _, candidate in sorted(self.heap, key=lambda item: item[0], reverse=True)]
+        for candidate in selected:
+            candidate.signature = signature_to_bytes(candidate.signature)
+        return selected
+
+
+def select_candidates(results, score, k, deduplicator, stats, blocks=None):
+    """Run the whole ingestion pipeline and return the top-k candidates"""
+    selector = TopKSelector(k, deduplicator)
+    entries = iter_unseen(iter_feed_batches(results, stats), stats)
+    for candidate in iter_scored(entries, score, stats, blocks=blocks):
+        selector.offer(candidate)
+    for candidate in selector.repeats:
+        stats.settle(candidate.feed_url, candidate.entry_id)
+    return selector.results(), selector.saved_calls
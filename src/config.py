@@ -15,6 +15,55 @@ RSS_FEEDS = [
     'https://www.espn.com/espn/rss/cricket/news',
 ]
 
+# RSS fetching
+RSS_FETCH_WORKERS = int(os.getenv('RSS_FETCH_WORKERS', '8'))  # Concurrent feed downloads (1 = sequential)
+RSS_FETCH_TIMEOUT = 15  # Per-feed timeout in seconds
+RSS_CONDITIONAL_GET = True  # Send If-None-Match/If-Modified-Since, parse unchanged feeds from the cached body
+RSS_FEED_BODY_TTL_HOURS = 24 * 7  # Cached feed body kept for 304s; without it the feed is fetched in full
+RSS_FEED_WATERMARK = True   # Stop parsing a feed at the entries settled (processed or filtered) by earlier runs
+
+RSS_FEED_REUSE_MINUTES = 10  # A feed downloaded this recently (e.g. before a crash) is parsed from its cached body
+FEED_FULL_TEXT = True        # Use full stories shipped in content:encoded / Atom content instead of scraping the page
+FEED_FULL_TEXT_MIN_CHARS = 500  # Same bar process_article uses for a full article; the quality threshold applies too
+
+# On-disk HTTP/extraction cache (pages, images, feeds, extracted text)
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '.http_cache')
+HTTP_CACHE_TTL_HOURS = 24
+HTTP_CACHE_MAX_MB = 200  # Least recently used entries are evicted above this
+
+# Shared HTTP transport (every client, feed and page download)
+HTTP_POOL_HOSTS = 16       # Hosts with a kept-alive connection pool
+HTTP_POOL_SIZE = 10        # Connections per host (>= RSS_FETCH_WORKERS for same-host feeds)
+HTTP_CONNECT_TIMEOUT = 5   # Seconds; also caps the connect phase of calls passing a single timeout
+HTTP_READ_TIMEOUT = 30     # Seconds, for calls that pass no timeout
+
+# Article page downloads (streamed; the body is only read once the headers pass these checks)
+PAGE_MAX_BYTES = 3 * 1024 * 1024  # Longer pages are cut off here (article text sits well before the end)
+PAGE_CONTENT_TYPES = ['text/html', 'application/xhtml+xml']  # Redirects to video pages, PDFs etc. are rejected
+
+# Adaptive feed schedule (stats per feed: python src/feed_health.py)
+FEED_SCHEDULE_ADAPTIVE = True
+FEED_BACKOFF_BASE_MINUTES = 120         # First failure skips the next run; doubles per consecutive failure
+FEED_BACKOFF_MAX_MINUTES = 24 * 60
+FEED_LOW_YIELD_THRESHOLD = 1.0          # Avg new priority entries per poll below this = low yield
+FEED_LOW_YIELD_INTERVAL_MINUTES = 180   # Low-yield feeds are polled every 3 hours
+FEED_LOW_YIELD_MIN_POLLS = 3            # Polls averaged before a feed can be slowed down
+FEED_YIELD_SMOOTHING = 0.3              # Weight of the latest poll in the yield average
+FEED_SCHEDULE_SLACK_SECONDS = 300       # Tolerate cron drift when checking if a feed is due
+
+# URL canonicalization (dedup key for articles)
+# Redirects are only followed for these proxy/shortener hosts; results are cached in SQLite
+URL_REDIRECT_HOSTS = [
+    'feeds.feedburner.com', 'feedproxy.google.com', 'rss.app', 'dlvr.it',
+    't.co', 'bit.ly', 'ow.ly', 'trib.al', 'buff.ly', 'tinyurl.com',
+]
+URL_REDIRECT_CACHE_HOURS = 30 * 24  # Resolved chains rarely change
+URL_REDIRECT_TIMEOUT = 10
+
+# Near-duplicate story detection (same story under different URLs)
+STORY_DEDUP_THRESHOLD = 0.5     # Estimated Jaccard similarity of title+summary words
+STORY_DEDUP_WINDOW_HOURS = 48   # Also compare against stories published this recently
+
 # Sport Priority (for filtering)
 # Cricket: +5 points, Football/Leagues: +3 points, Other sports: +2 points
 PRIORITY_SPORTS = {
@@ -50,6 +99,40 @@ BETTING_TRIGGERS = [
 # Processing limits (Optimized for hourly runs)
 MAX_ARTICLES_PER_RUN = 1  # 1 article per hour = 24 articles/day
 MAX_CONTENT_LENGTH = 3000
+
+# Article extraction
+# 'cascade': try strategies in order, stop at the first result above the quality threshold
+# 'thorough': run every strategy and keep the longest result (slowest, previous behavior)
+# 'parallel': run every strategy at once in worker processes, best result at the deadline wins
+EXTRACTION_MODE = os.getenv('EXTRACTION_MODE', 'cascade')
+EXTRACTION_CASCADE = ['trafilatura', 'newspaper3k', 'readability', 'beautifulsoup']
+EXTRACTION_QUALITY_THRESHOLD = 0.75  # 0-1 score from length, paragraphs, boilerplate and link density
+EXTRACTION_DEADLINE_SECONDS = 30     # Per URL, download included
+EXTRACTION_WORKERS = 4               # Parallel mode: one process per strategy
+EXTRACTION_WORKER_MEMORY_MB = 2048   # Parallel mode: address-space cap per worker (Linux/macOS)
+EXTRACTION_MAX_TASKS_PER_CHILD = 25  # Parallel mode: replace workers regularly to release leaked memory
+EXTRACTION_LEARN_STRATEGIES = True  # Per-domain history reorders the cascade (report: python src/extraction_stats.py)
+EXTRACTION_SKIP_MIN_ATTEMPTS = 5     # Strategies with no success in this many tries on a domain become fallbacks only
+EXTRACTION_JSON_LD = True           # Use the article body embedded as schema.org JSON-LD when it passes the quality check
+EXTRACTION_SITE_PROFILES = True     # Known sites (src/profiles/*.json) try their selectors before the generic strategies
+EXTRACTION_PAGE_VARIANTS = True     # Fetch a domain's AMP/lite page first once its pattern is known (report: python src/page_variants.py)
+EXTRACTION_VARIANT_SECONDS = 10     # Cap on the AMP/lite attempt (at most a third of the deadline); the rest is kept for the canonical page
+PAGE_VARIANT_TEMPLATES = [           # Patterns tried against a page's <link rel="amphtml">
+    '{url}/amp', '{url}.amp', '{url}.amp.html', '{scheme}://amp.{host}{path}', '{scheme}://{host}/amp{path}',
+    '{url}?amp', '{url}?amp=1', '{url}?outputType=amp',
+]
+PAGE_VARIANTS = {}                   # Fixed templates per domain, e.g. {'cnn.com': 'https://lite.cnn.com{path}'}
+PAGE_VARIANT_MAX_FAILURES = 3        # Consecutive variant pages failing the quality check before a domain goes back to canonical pages
+DOMAIN_BLOCK_TTL_HOURS = {            # Remembered scraping failures per domain (report: python src/domain_blocks.py)
+    'forbidden': 24,                  # 401/403/451 responses
+    'consent': 72,                    # Redirected to a cookie/consent wall
+    'paywall': 72,                    # Page marks itself isAccessibleForFree=false and nothing was extracted
+    'timeout': 3,                     # Connect/read timeouts
+}
+DOMAIN_BLOCK_PENALTY = 2              # Priority points taken off candidates from blocked domains
+BOILERPLATE_LEARNING = True           # Strip paragraphs repeated across a domain's pages (report: python src/boilerplate.py)
+BOILERPLATE_MIN_PAGES = 3             # A paragraph must have been seen on this many pages of the domain...
+BOILERPLATE_MIN_SHARE = 0.3           # ...and on this share of all its fingerprinted pages
 MAX_IMAGE_SIZE_MB = 2
 ARTICLE_DELAY_SECONDS = 3  # Delay between articles (not needed for 1 article)
 
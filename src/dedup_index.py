@@ -0,0 +1,197 @@
+"""
+In-Memory Seen-URL Index
+Compact front for the articles table so most duplicate checks never reach SQLite.
+
+Keys are the md5 hex digests stored in articles.url_hash. Both indexes may return
+false positives (callers confirm those against SQLite) but never false negatives.
+"""
+
+import os
+import math
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+
+def _hash_pair(url_hash):
+    """Split an md5 hex digest into two independent 64-bit integers"""
+    return int(url_hash[:16], 16), int(url_hash[16:32], 16)
+
+
+class BloomFilter:
+    """
+    Bloom filter over md5 hex digests
+    md5 is already uniform, so double hashing on its two halves is enough
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(int(capacity), 1000)
+        self.num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def add(self, url_hash):
+        h1, h2 = _hash_pair(url_hash)
+        h2 |= 1
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % self.num_bits
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def might_contain(self, url_hash):
+        h1, h2 = _hash_pair(url_hash)
+        h2 |= 1
+        bits, num_bits = self.bits, self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False  # Most misses exit after the first probe
+        return True
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+class SortedHashIndex:
+    """
+    Sorted array of 8-byte hash prefixes searched by binary search
+    Can be persisted as a snapshot file and memory-mapped on the next run
+    """
+
+    # Snapshot header: row count and max article id, used to detect staleness
+    HEADER = struct.Struct('<QQ')
+
+    def __init__(self, prefixes=None):
+        self.prefixes = prefixes if prefixes is not None else array('Q')
+        self.recent = set()  # Hashes added after the sorted array was built
+        self._mmap = None
+
+    @classmethod
+    def build(cls, url_hashes):
+        values = sorted(_hash_pair(h)[0] for h in url_hashes)
+        return cls(array('Q', values))
+
+    def add(self, url_hash):
+        self.recent.add(_hash_pair(url_hash)[0])
+
+    def might_contain(self, url_hash):
+        prefix = _hash_pair(url_hash)[0]
+        if prefix in self.recent:
+            return True
+        prefixes = self.prefixes
+        i = bisect_left(prefixes, prefix)
+        return i < len(prefixes) and prefixes[i] == prefix
+
+    @property
+    def count(self):
+        return len(self.prefixes) + len(self.recent)
+
+    @property
+    def nbytes(self):
+        return len(self.prefixes) * 8
+
+    def save(self, path, row_count, max_id):
+        """Write the sorted array (plus recent additions) as a snapshot file"""
+        values = array('Q', sorted(set(self.prefixes) | self.recent)) if self.recent else self.prefixes
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(row_count, max_id))
+            values.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, row_count, max_id):
+        """
+        Memory-map a snapshot file
+
+        Returns:
+            SortedHashIndex, or None if the snapshot is missing or stale
+        """
+        if not os.path.exists(path) or os.path.getsize(path) < cls.HEADER.size:
+            return None
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        saved_count, saved_max_id = cls.HEADER.unpack_from(mapped, 0)
+        body = len(mapped) - cls.HEADER.size
+        if (saved_count, saved_max_id) != (row_count, max_id) or body % 8:
+            mapped.close()
+            return None
+        index = cls(memoryview(mapped)[cls.HEADER.size:].cast('Q'))
+        index._mmap = mapped
+        return index
+
+
+def build_index(kind, url_hashes, expected=0):
+    """
+    Build a seen-URL index
+
+    Args:
+        kind: 'bloom' or 'sorted'
+        url_hashes: Iterable of md5 hex digests
+        expected: Row count hint used to size the Bloom filter
+    """
+    if kind == 'bloom':
+        # Leave headroom for URLs marked during this and future runs
+        index = BloomFilter(capacity=max(expected * 2, 10000))
+        for h in url_hashes:
+            index.add(h)
+        return index
+    if kind == 'sorted':
+        return SortedHashIndex.build(url_hashes)
+    raise ValueError(f"Unknown dedup index type: {kind}")
+
+
+# Benchmark: lookup throughput and memory at 100k and 1M rows
+if __name__ == "__main__":
+    import sqlite3
+    import tempfile
+    import time
+    import uuid
+    import hashlib
+    import tracemalloc
+
+    def make_hashes(n):
+        return [hashlib.md5(uuid.uuid4().bytes).hexdigest() for _ in range(n)]
+
+    for rows in (100_000, 1_000_000):
+        stored = make_hashes(rows)
+        probes = stored[:25_000] + make_hashes(25_000)  # 50% hits, 50% misses
+
+        db_dir = tempfile.TemporaryDirectory()
+        conn = sqlite3.connect(os.path.join(db_dir.name, 'bench.db'))
+        conn.execute('CREATE TABLE articles (id INTEGER PRIMARY KEY, url_hash TEXT UNIQUE)')
+        conn.executemany('INSERT INTO articles (url_hash) VALUES (?)', ((h,) for h in stored))
+        conn.commit()
+
+        start = time.perf_counter()
+        for h in probes:
+            conn.execute('SELECT 1 FROM articles WHERE url_hash = ?', (h,)).fetchone()
+        sqlite_rate = len(probes) / (time.perf_counter() - start)
+
+        print(f"\n{rows:,} rows ({len(probes):,} probes, 50% hits)")
+        print(f"  {'sqlite':<8} {sqlite_rate:>12,.0f} lookups/s")
+
+        for kind in ('set', 'bloom', 'sorted'):
+            tracemalloc.start()
+            if kind == 'set':
+                index = set(stored)
+                lookup = index.__contains__
+            else:
+                index = build_index(kind, stored, expected=rows)
+                lookup = index.might_contain
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            false_positives = sum(1 for h in probes[25_000:] if lookup(h))
+            for h in probes[:25_000]:
+                lookup(h)
+            rate = len(probes) / (time.perf_counter() - start)
+            print(f"  {kind:<8} {rate:>12,.0f} lookups/s  {memory / 1024 / 1024:>8.1f} MB  "
+                  f"{false_positives} false positives")
+
+        conn.close()
+        db_dir.cleanup()
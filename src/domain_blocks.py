@@ -0,0 +1,82 @@
+"""
+Blocked Domain Cache
+Remembers domains that refused to be scraped: 403s, consent walls, paywalls and
+timeouts, each with its own TTL. While a block is active, candidates from the domain
+are ranked lower at ingestion, and process_article goes straight to the RSS summary
+instead of paying for a full extraction attempt that will fail again.
+
+Run `python src/domain_blocks.py` to list active blocks.
+"""
+
+import re
+import time
+from urllib.parse import urlparse
+import requests
+from utils import logger, get_domain_blocks, save_domain_block
+from extraction_stats import domain_of
+from config import DOMAIN_BLOCK_TTL_HOURS
+
+FORBIDDEN_STATUSES = frozenset({401, 403, 451})
+
+# schema.org paywall marker, in JSON-LD or microdata
+_PAYWALLED = re.compile(rb'"?isAccessibleForFree"?\s*[:=]\s*"?false', re.IGNORECASE)
+_CONSENT_HOSTS = ('consent.', 'guce.')
+_CONSENT_PATHS = ('/consent', '/cookie-consent', '/privacy-gate')
+
+
+def classify_error(error):
+    """Failure class of a download exception, or None if it says nothing about the domain"""
+    if isinstance(error, requests.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        if error.response.status_code in FORBIDDEN_STATUSES:
+            return 'forbidden'
+    return None
+
+
+def classify_page(final_url, html):
+    """Failure class of a page that downloaded but yielded no article ('consent', 'paywall'), or None"""
+    parts = urlparse(final_url or '')
+    host = (parts.hostname or '').lower()
+    if host.startswith(_CONSENT_HOSTS) or parts.path.lower().startswith(_CONSENT_PATHS):
+        return 'consent'
+    if html and _PAYWALLED.search(html):
+        return 'paywall'
+    return None
+
+
+def record_block(url, failure_class):
+    """Block the URL's domain for the failure class's TTL"""
+    ttl_hours = DOMAIN_BLOCK_TTL_HOURS.get(failure_class)
+    if not ttl_hours:
+        return
+    domain = domain_of(url)
+    save_domain_block(domain, failure_class, time.time() + ttl_hours * 3600)
+    logger.warning(f"🚫 {domain} blocked for {ttl_hours}h ({failure_class}), extraction will be skipped")
+
+
+def active_blocks():
+    """{domain: {failure_class: expires_at}} for every unexpired block (one query per call)"""
+    return get_domain_blocks(time.time())
+
+
+def block_for(url, blocks=None):
+    """Active failure class for a URL's domain (the longest-lasting one), or None"""
+    classes = (active_blocks() if blocks is None else blocks).get(domain_of(url))
+    return max(classes, key=classes.get) if classes else None
+
+
+def print_report():
+    """Print active blocks with time left"""
+    now = time.time()
+    print(f"{'Domain':<32} {'Failure':<10} {'Expires in':>10}")
+    for domain, classes in sorted(active_blocks().items()):
+        for failure_class, expires_at in sorted(classes.items()):
+            print(f"{domain[:32]:<32} {failure_class:<10} {(expires_at - now) / 3600:>9.1f}h")
+
+
+if __name__ == "__main__":
+    from utils import init_database
+
+    init_database()
+    print_report()
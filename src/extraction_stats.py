@@ -0,0 +1,73 @@
+"""
+Per-Domain Extraction Statistics
+Each source domain nearly always has the same winning extraction strategy. Win counts,
+success rates and latencies per (domain, strategy) decide the cascade order:
+- the historical winner runs first
+- strategies that never succeed on a domain only run if everything else failed
+
+Run `python src/extraction_stats.py` for a per-domain report.
+"""
+
+from urllib.parse import urlparse
+from utils import get_extraction_stats, get_extraction_domains
+from config import EXTRACTION_LEARN_STRATEGIES, EXTRACTION_SKIP_MIN_ATTEMPTS
+
+
+def domain_of(url):
+    """Stats key for a URL: lowercase host without 'www.'"""
+    host = (urlparse(url or '').hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def plan_strategies(domain, order):
+    """
+    Order strategies for a domain from its history
+
+    Returns:
+        tuple: (strategies to run in order, fallback strategies that never succeeded here)
+    """
+    order = list(order)
+    if not EXTRACTION_LEARN_STRATEGIES:
+        return order, []
+
+    stats = get_extraction_stats(domain).get(domain, {})
+    if not stats:
+        return order, []
+
+    position = {method: i for i, method in enumerate(order)}
+    # Most wins first; the configured cascade order breaks ties
+    ranked = sorted(order, key=lambda method: (-stats.get(method, {}).get('wins', 0), position[method]))
+    fallback = [method for method in ranked
+                if stats.get(method, {}).get('attempts', 0) >= EXTRACTION_SKIP_MIN_ATTEMPTS
+                and stats[method]['successes'] == 0]
+    planned = [method for method in ranked if method not in fallback]
+    if not planned:
+        return ranked, []  # Nothing has worked here yet: keep trying everything
+    return planned, fallback
+
+
+def print_report():
+    """Print winning strategy, success rates and average extraction time per domain"""
+    stats = get_extraction_stats()
+    domains = get_extraction_domains()
+
+    print(f"{'Domain':<28} {'Runs':>5} {'Fail%':>6} {'Avg s':>6}  {'Winner':<14} {'Win%':>5}  Strategies (success% / avg s)")
+    for domain, totals in sorted(domains.items(), key=lambda item: item[1]['extractions'], reverse=True):
+        methods = stats.get(domain, {})
+        runs = totals['extractions'] or 1
+        winner = max(methods.values(), key=lambda row: row['wins'], default=None)
+        winner_name = winner['method'] if winner and winner['wins'] else '-'
+        win_share = 100 * winner['wins'] / runs if winner and winner['wins'] else 0
+        detail = ', '.join(
+            f"{row['method']} {100 * row['successes'] / row['attempts']:.0f}%/{row['total_latency'] / row['attempts']:.2f}s"
+            for row in sorted(methods.values(), key=lambda row: row['wins'], reverse=True) if row['attempts']
+        )
+        print(f"{domain[:28]:<28} {totals['extractions']:>5} {100 * totals['failures'] / runs:>6.0f} "
+              f"{totals['total_time'] / runs:>6.2f}  {winner_name:<14} {win_share:>5.0f}  {detail}")
+
+
+if __name__ == "__main__":
+    from utils import init_database
+
+    init_database()
+    print_report()
@@ -0,0 +1,169 @@
+"""
+Concurrent RSS Feed Fetcher
+Downloads all configured feeds in parallel so a slow feed only costs its own timeout.
+Uses conditional GET (ETag / Last-Modified) so unchanged feeds are not downloaded again;
+their cached body is parsed instead, so entries earlier runs did not get to are still offered.
+"""
+
+import time
+import hashlib
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from feed_parser import parse_feed, next_watermark
+from http_cache import get_cache
+from http_transport import get_session
+from utils import logger, get_feed_validators, save_feed_validators, get_feed_watermark, save_feed_watermark
+from config import (RSS_FETCH_WORKERS, RSS_FETCH_TIMEOUT, RSS_CONDITIONAL_GET, RSS_FEED_WATERMARK,
+                    RSS_FEED_REUSE_MINUTES, RSS_FEED_BODY_TTL_HOURS)
+
+
+class FeedResult:
+    """Outcome of fetching and parsing a single feed"""
+
+    __slots__ = ('feed_url', 'feed', 'error', 'elapsed', 'not_modified')
+
+    def __init__(self, feed_url, feed=None, error=None, elapsed=0.0, not_modified=False):
+        self.feed_url = feed_url
+        self.feed = feed
+        self.error = error
+        self.elapsed = elapsed
+        self.not_modified = not_modified  # 304 or identical body - parsed from the cached copy
+
+    @property
+    def ok(self):
+        return self.error is None and self.feed is not None
+
+
+def _conditional_headers(validators):
+    """Build If-None-Match / If-Modified-Since headers from stored validators"""
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def _cached_body(feed_url, body_hash):
+    """The cached feed body the stored validators describe, or None"""
+    if not body_hash:
+        return None
+    hit = get_cache().get('feed', feed_url, ttl_hours=RSS_FEED_BODY_TTL_HOURS)
+    if hit and hashlib.sha256(hit[1]).hexdigest() == body_hash:
+        return hit[1]
+    return None
+
+
+def _parse(feed_url, content, start, not_modified=False):
+    watermark = get_feed_watermark(feed_url) if RSS_FEED_WATERMARK else None
+    feed = parse_feed(content, watermark)
+    logger.debug(f"Fetched {feed_url} in {time.monotonic() - start:.2f}s "
+                 f"({feed.parser}, {len(feed.entries)} entries{', unchanged' if not_modified else ''})")
+    return FeedResult(feed_url, feed=feed, elapsed=time.monotonic() - start, not_modified=not_modified)
+
+
+def fetch_feed(feed_url, timeout=RSS_FETCH_TIMEOUT):
+    """Fetch and parse one feed, never raising"""
+    start = time.monotonic()
+    try:
+        # Downloaded by a run minutes ago (e.g. a re-run after a crash): parse that body again
+        recent = get_cache().get('feed', feed_url, RSS_FEED_REUSE_MINUTES / 60) if RSS_FEED_REUSE_MINUTES else None
+        if recent:
+            logger.debug(f"Feed fetched less than {RSS_FEED_REUSE_MINUTES} min ago, reusing its body: {feed_url}")
+            return _parse(feed_url, recent[1], start, not_modified=True)
+        
+        validators = get_feed_validators(feed_url) if RSS_CONDITIONAL_GET else {}
+        # A 304 is only useful with the body it validates: unchanged feeds are parsed from it
+        cached = _cached_body(feed_url, validators.get('body_hash'))
+        headers = _conditional_headers(validators) if cached else {}
+        
+        # Fetch with requests first, then parse the body ourselves
+        resp = get_session().get(feed_url, headers=headers, timeout=timeout)
+        
+        if resp.status_code == 304:
+            logger.debug(f"Feed not modified (304): {feed_url}")
+            return _parse(feed_url, cached, start, not_modified=True)
+        
+        resp.raise_for_status()
+        
+        # Some servers ignore validators; an identical body is just as unchanged
+        body_hash = hashlib.sha256(resp.content).hexdigest()
+        get_cache().put('feed', feed_url, resp.content, {'url': resp.url, 'content_type': resp.headers.get('Content-Type', '')})
+        if RSS_CONDITIONAL_GET:
+            save_feed_validators(feed_url, resp.headers.get('ETag'), resp.headers.get('Last-Modified'), body_hash)
+        
+        return _parse(feed_url, resp.content, start, not_modified=body_hash == validators.get('body_hash'))
+    except Exception as e:
+        return FeedResult(feed_url, error=e, elapsed=time.monotonic() - start)
+
+
+def fetch_feeds(feed_urls, max_workers=RSS_FETCH_WORKERS):
+    """
+    Fetch feeds concurrently
+
+    Args:
+        feed_urls: Feed URLs in priority order
+        max_workers: Concurrency limit (1 = sequential)
+
+    Returns:
+        list[FeedResult]: One result per feed, in the same order as feed_urls
+    """
+    feed_urls = list(feed_urls)
+    if not feed_urls:
+        return []
+
+    workers = max(1, min(max_workers, len(feed_urls)))
+    if workers == 1:
+        return [fetch_feed(url) for url in feed_urls]
+
+    # executor.map preserves input order, so entry merging stays deterministic
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rss') as executor:
+        return list(executor.map(fetch_feed, feed_urls))
+
+
+def save_watermarks(results, settled):
+    """
+    Move each feed's watermark past the entries this run settled
+
+    Call after the selected articles were processed: entries that were outranked, or
+    failed extraction or posting, stay above the watermark for the next run.
+
+    Args:
+        results: FeedResult list from fetch_feeds
+        settled: {feed_url: ids of entries that need no further look}
+    """
+    if not RSS_FEED_WATERMARK:
+        return
+    for result in results:
+        if not result.ok:
+            continue
+        watermark = next_watermark(result.feed, settled.get(result.feed_url, ()))
+        if watermark:
+            save_feed_watermark(result.feed_url, watermark['guid'], watermark['published'])
+
+
+# Path segments that name the format rather than the feed
+_FEED_SEGMENTS = frozenset({'rss', 'rss.xml', 'feed', 'feeds', 'feed.xml', 'atom.xml', 'index.xml'})
+
+
+def feed_label(feed_url):
+    """Short unique label for a feed: host plus the path segments that tell section feeds apart"""
+    parts = urlparse(feed_url)
+    segments = [segment[:-4] if segment.endswith('.xml') else segment
+                for segment in parts.path.split('/') if segment and segment.lower() not in _FEED_SEGMENTS]
+    label = '/'.join([parts.netloc.replace('www.', '')] + segments)
+    return f"{label}?{parts.query}" if parts.query else label
+
+
+def format_timings(results):
+    """Compact per-feed timing summary for the RSS Summary log line"""
+    parts = []
+    for result in results:
+        if not result.ok:
+            status = ' ERR'
+        elif result.not_modified:
+            status = ' 304'
+        else:
+            status = ''
+        parts.append(f"{feed_label(result.feed_url)} {result.elapsed:.2f}s{status}")
+    return ', '.join(parts)
@@ -0,0 +1,128 @@
+"""
+Feed Health Statistics and Adaptive Polling
+Records latency, error rate, yield and last success per feed, and uses them to decide
+which feeds are polled this run:
+- failing feeds back off exponentially
+- low-yield feeds are polled less often
+- high-yield feeds are polled every run
+
+Run `python src/feed_health.py` for a report of where fetch time goes.
+"""
+
+import time
+from datetime import datetime
+from utils import logger, get_feed_stats, save_feed_stats
+from config import (RSS_FEEDS, FEED_SCHEDULE_ADAPTIVE, FEED_BACKOFF_BASE_MINUTES, FEED_BACKOFF_MAX_MINUTES,
+                    FEED_LOW_YIELD_THRESHOLD, FEED_LOW_YIELD_INTERVAL_MINUTES, FEED_YIELD_SMOOTHING,
+                    FEED_LOW_YIELD_MIN_POLLS, FEED_SCHEDULE_SLACK_SECONDS)
+
+
+def due_feeds(feed_urls, now=None):
+    """
+    Split feeds into those due this run and those skipped by the schedule
+
+    Returns:
+        tuple: (due feed URLs in original order, {skipped URL: next poll epoch})
+    """
+    feed_urls = list(feed_urls)
+    if not FEED_SCHEDULE_ADAPTIVE:
+        return feed_urls, {}
+
+    now = now or time.time()
+    stats = get_feed_stats()
+    due, skipped = [], {}
+    for feed_url in feed_urls:
+        next_poll_at = (stats.get(feed_url) or {}).get('next_poll_at') or 0
+        # Slack absorbs cron drift so an hourly feed is not skipped by a few seconds
+        if next_poll_at <= now + FEED_SCHEDULE_SLACK_SECONDS:
+            due.append(feed_url)
+        else:
+            skipped[feed_url] = next_poll_at
+
+    for feed_url, next_poll_at in skipped.items():
+        logger.info(f"Skipping feed until {datetime.fromtimestamp(next_poll_at):%H:%M}: {feed_url}")
+    return due, skipped
+
+
+def next_poll_time(row, now):
+    """Schedule the next poll from a feed's updated stats"""
+    failures = row['consecutive_errors']
+    if failures:
+        backoff = min(FEED_BACKOFF_BASE_MINUTES * 2 ** (failures - 1), FEED_BACKOFF_MAX_MINUTES)
+        return now + backoff * 60
+
+    # Judge yield only once a few polls have been averaged
+    if (row['fetches'] >= FEED_LOW_YIELD_MIN_POLLS and row['yield_avg'] is not None
+            and row['yield_avg'] < FEED_LOW_YIELD_THRESHOLD):
+        return now + FEED_LOW_YIELD_INTERVAL_MINUTES * 60
+
+    return now  # High yield: poll every run
+
+
+def record_feed_results(results, new_entries, now=None):
+    """
+    Update health stats after a fetch
+
+    Args:
+        results: FeedResult list from feed_fetcher.fetch_feeds
+        new_entries: {feed_url: count of new, priority-passing entries this poll}
+    """
+    now = now or time.time()
+    stats = get_feed_stats()
+
+    for result in results:
+        row = stats.get(result.feed_url) or {
+            'fetches': 0, 'errors': 0, 'consecutive_errors': 0, 'total_latency': 0.0,
+            'new_entries': 0, 'yield_avg': None, 'last_success': None,
+        }
+        row['fetches'] += 1
+        row['total_latency'] += result.elapsed
+        row['last_attempt'] = now
+
+        if result.ok:
+            count = new_entries.get(result.feed_url, 0)
+            row['consecutive_errors'] = 0
+            row['last_success'] = now
+            row['new_entries'] += count
+            # Smoothed yield per poll; the first poll seeds it
+            if row['yield_avg'] is None:
+                row['yield_avg'] = float(count)
+            else:
+                row['yield_avg'] += FEED_YIELD_SMOOTHING * (count - row['yield_avg'])
+        else:
+            row['errors'] += 1
+            row['consecutive_errors'] += 1
+
+        row['next_poll_at'] = next_poll_time(row, now)
+        save_feed_stats(result.feed_url, row)
+
+
+def _format_time(epoch):
+    return datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M') if epoch else '-'
+
+
+def print_report(feed_urls=RSS_FEEDS):
+    """Print per-feed health stats, slowest total fetch time first"""
+    stats = get_feed_stats()
+    urls = list(dict.fromkeys(list(feed_urls) + list(stats)))
+    rows = [(url, stats.get(url)) for url in urls]
+    total_time = sum(row['total_latency'] for _, row in rows if row) or 1.0
+
+    print(f"{'Feed':<62} {'Polls':>5} {'Err%':>5} {'Avg s':>6} {'Time%':>6} {'Yield':>6} "
+          f"{'Last success':>16} {'Next poll':>16}")
+    for url, row in sorted(rows, key=lambda item: item[1]['total_latency'] if item[1] else -1, reverse=True):
+        if not row:
+            print(f"{url[:62]:<62} {'never polled':>5}")
+            continue
+        fetches = row['fetches'] or 1
+        yield_avg = row['yield_avg'] if row['yield_avg'] is not None else 0.0
+        print(f"{url[:62]:<62} {row['fetches']:>5} {100 * row['errors'] / fetches:>5.0f} "
+              f"{row['total_latency'] / fetches:>6.2f} {100 * row['total_latency'] / total_time:>6.1f} "
+              f"{yield_avg:>6.1f} {_format_time(row['last_success']):>16} {_format_time(row['next_poll_at']):>16}")
+
+
+if __name__ == "__main__":
+    from utils import init_database
+
+    init_database()
+    print_report()
@@ -0,0 +1,284 @@
+"""
+On-Disk HTTP and Extraction Cache
+Content-addressed store shared by the article extractor, image discovery and the
+feed fetcher, so a crashed or rejected run does not download and extract the same
+pages again on the next run.
+
+- raw responses are keyed by canonical URL, extracted text by (URL, extractor version)
+- bodies are zlib-compressed; each entry carries its own TTL check
+- total size is capped, least recently used entries are evicted first
+
+Downloads are streamed: the content type is checked before any of the body is read,
+bodies are capped in size and article pages can stop at the closing </article>.
+"""
+
+import os
+import json
+import time
+import zlib
+import struct
+import hashlib
+import threading
+import requests
+from utils import logger
+from url_canonical import canonicalize_url
+from site_profiles import profile_for
+from http_transport import get_session
+from config import (HTTP_CACHE_DIR, HTTP_CACHE_TTL_HOURS, HTTP_CACHE_MAX_MB, PAGE_MAX_BYTES, PAGE_CONTENT_TYPES,
+                    MAX_IMAGE_SIZE_MB)
+
+# Entry file: 4-byte metadata length, JSON metadata, zlib-compressed body
+_META_LENGTH = struct.Struct('<I')
+
+# Everything an extractor needs is above these on pages of early-stop sites
+EARLY_STOP_MARKERS = (b'</article>', b'</main>')
+_CHUNK_SIZE = 64 * 1024
+
+
+class UnwantedContent(requests.RequestException):
+    """Response rejected by content type or size; its body was not (fully) read"""
+
+
+class HttpCache:
+    """
+    Size-capped LRU cache of compressed bodies on disk
+
+    Usage:
+        cache = HttpCache('.http_cache')
+        cache.put('page', url, body, {'content_type': 'text/html'})
+        hit = cache.get('page', url, ttl_hours=24)  # (meta, body) or None
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._size = None  # Total bytes on disk, scanned on first write
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, namespace, key):
+        digest = hashlib.sha256(f"{namespace}\0{key}".encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def get(self, namespace, key, ttl_hours=HTTP_CACHE_TTL_HOURS):
+        """Return (meta, body) if cached and younger than ttl_hours, else None"""
+        path = self._path(namespace, key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            (meta_length,) = _META_LENGTH.unpack_from(data)
+            meta = json.loads(data[_META_LENGTH.size:_META_LENGTH.size + meta_length])
+            if time.time() - meta['stored_at'] > ttl_hours * 3600:
+                self.misses += 1
+                return None
+            body = zlib.decompress(data[_META_LENGTH.size + meta_length:])
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, struct.error, zlib.error) as e:
+            logger.debug(f"Dropping unreadable cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mtime doubles as the LRU clock
+        except OSError:
+            pass
+        self.hits += 1
+        return meta, body
+
+    def put(self, namespace, key, body, meta=None):
+        """Store a body (bytes) with optional JSON-serializable metadata"""
+        meta = dict(meta or {}, key=key, stored_at=time.time())
+        encoded_meta = json.dumps(meta).encode()
+        data = _META_LENGTH.pack(len(encoded_meta)) + encoded_meta + zlib.compress(body, 6)
+
+        path = self._path(namespace, key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry: {e}")
+            self._remove(tmp_path)
+            return
+
+        with self.lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Delete least recently used entries until the cache is at 80% of its cap"""
+        target = self.max_bytes * 0.8
+        removed = 0
+        for path, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+            if self._size <= target:
+                break
+            if self._remove(path):
+                self._size -= size
+                removed += 1
+        logger.info(f"HTTP cache evicted {removed} entries ({self._size / 1024 / 1024:.1f}MB kept)")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+class CachedResponse:
+    """The parts of a requests.Response callers use, from the network or the cache"""
+
+    __slots__ = ('url', 'content', 'content_type', 'from_cache')
+
+    def __init__(self, url, content, content_type='', from_cache=False):
+        self.url = url
+        self.content = content
+        self.content_type = content_type
+        self.from_cache = from_cache
+
+
+# Global instance
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Get or create the global cache instance"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
+
+
+def _media_type(content_type):
+    return content_type.split(';', 1)[0].strip().lower()
+
+
+def _check_content_type(url, content_type, content_types):
+    if content_types and content_type and not _media_type(content_type).startswith(tuple(content_types)):
+        raise UnwantedContent(f"Unwanted content type {_media_type(content_type)} for {url}")
+
+
+def _read_body(resp, max_bytes, truncate, early_stop):
+    """Read a streamed body up to max_bytes, or up to the first early-stop marker"""
+    length = resp.headers.get('Content-Length', '')
+    if max_bytes and not truncate and length.isdigit() and int(length) > max_bytes:
+        raise UnwantedContent(f"{resp.url} is {int(length) / 1024:.0f}KB (limit {max_bytes / 1024:.0f}KB)")
+
+    body = bytearray()
+    overlap = max(len(marker) for marker in EARLY_STOP_MARKERS) - 1
+    for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+        searched_from = max(0, len(body) - overlap)
+        body += chunk
+        if early_stop:
+            window = body[searched_from:].lower()
+            hits = [(window.find(marker), len(marker)) for marker in EARLY_STOP_MARKERS if marker in window]
+            if hits:
+                pos, size = min(hits)
+                del body[searched_from + pos + size:]
+                logger.debug(f"Stopped reading {resp.url} after {len(body) / 1024:.0f}KB (end of article)")
+                break
+        if max_bytes and len(body) > max_bytes:
+            if not truncate:
+                raise UnwantedContent(f"{resp.url} exceeds {max_bytes / 1024:.0f}KB")
+            del body[max_bytes:]
+            logger.debug(f"Truncated {resp.url} at {max_bytes / 1024:.0f}KB")
+            break
+    return bytes(body)
+
+
+def fetch(url, session=None, timeout=20, ttl_hours=HTTP_CACHE_TTL_HOURS, namespace='page',
+          content_types=None, max_bytes=None, truncate=False, early_stop=False, **kwargs):
+    """
+    GET a URL through the cache
+
+    Only successful responses are stored; errors raise like requests' raise_for_status.
+
+    Args:
+        content_types: Accepted media type prefixes, checked before the body is read
+        max_bytes: Body size limit (decoded bytes)
+        truncate: Keep the first max_bytes of a longer body instead of rejecting it
+        early_stop: Stop reading after the first </article> or </main>
+
+    Returns:
+        CachedResponse
+
+    Raises:
+        UnwantedContent: Content type not accepted, or body over max_bytes without truncate
+    """
+    key = canonicalize_url(url)
+    cached = get_cache().get(namespace, key, ttl_hours)
+    if cached:
+        meta, body = cached
+        logger.debug(f"Cache hit ({namespace}): {url}")
+        _check_content_type(url, meta.get('content_type', ''), content_types)
+        return CachedResponse(meta.get('url', url), body, meta.get('content_type', ''), from_cache=True)
+
+    with (session or get_session()).get(url, timeout=timeout, stream=True, **kwargs) as resp:
+        resp.raise_for_status()
+        content_type = resp.headers.get('Content-Type', '')
+        _check_content_type(resp.url, content_type, content_types)
+        content = _read_body(resp, max_bytes, truncate, early_stop)
+    get_cache().put(namespace, key, content, {'url': resp.url, 'content_type': content_type})
+    return CachedResponse(resp.url, content, content_type)
+
+
+def fetch_page(url, session=None, timeout=20, **kwargs):
+    """fetch() an article page: HTML only, size-capped, early stop where the site profile allows it"""
+    profile = profile_for(url)
+    return fetch(url, session=session, timeout=timeout, content_types=PAGE_CONTENT_TYPES,
+                 max_bytes=PAGE_MAX_BYTES, truncate=True, early_stop=bool(profile and profile.early_stop), **kwargs)
+
+
+def fetch_image(url, session=None, timeout=10, **kwargs):
+    """fetch() an image: image/* only, rejected above MAX_IMAGE_SIZE_MB"""
+    return fetch(url, session=session, timeout=timeout, namespace='image', content_types=['image/'],
+                 max_bytes=MAX_IMAGE_SIZE_MB * 1024 * 1024, **kwargs)
+
+
+def get_extracted_text(url, version, ttl_hours=HTTP_CACHE_TTL_HOURS):
+    """Cached extraction result for (canonical URL, extractor version), or None"""
+    cached = get_cache().get('text', f"{canonicalize_url(url)}|{version}", ttl_hours)
+    return cached[1].decode('utf-8') if cached else None
+
+
+def save_extracted_text(url, version, text):
+    """Cache an extraction result for (canonical URL, extractor version)"""
+    get_cache().put('text', f"{canonicalize_url(url)}|{version}", text.encode('utf-8'))
+
+
+def get_page_meta(url, ttl_hours=HTTP_CACHE_TTL_HOURS):
+    """Metadata found while extracting a page (e.g. {'image': og:image URL}), or {}"""
+    cached = get_cache().get('meta', canonicalize_url(url), ttl_hours)
+    return json.loads(cached[1]) if cached else {}
+
+
+def save_page_meta(url, meta):
+    """Store metadata found while extracting a page, so nobody parses it again for it"""
+    get_cache().put('meta', canonicalize_url(url), json.dumps(meta).encode())
@@ -0,0 +1,69 @@
+"""
+Shared HTTP Transport
+One pooled requests.Session for every client (Serper, OpenRouter, WordPress,
+Cloudflare, APIFree), the feed fetcher, redirect resolution and all page and image
+downloads, so connections and TLS sessions are reused across the whole run.
+
+- per-host keep-alive pools sized for the concurrent feed fetcher
+- gzip/deflate, plus brotli when the brotli package is installed
+- a default (connect, read) timeout for any call that does not pass one, and the
+  same short connect timeout for calls that pass a single number
+- no shared credentials or content types: clients pass auth and headers per request
+"""
+
+import atexit
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from utils import logger
+from config import HTTP_POOL_HOSTS, HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes 'br' responses when it is importable)
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+USER_AGENT = 'Mozilla/5.0 (compatible; NewsBot/1.0)'
+
+
+class TimeoutAdapter(HTTPAdapter):
+    """Connection-pooling adapter that applies the transport's timeout policy"""
+
+    def __init__(self, connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT, **kwargs):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = (self.connect_timeout, self.read_timeout)
+        elif isinstance(timeout, (int, float)):
+            timeout = (min(self.connect_timeout, timeout), timeout)
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+def create_session(pool_hosts=HTTP_POOL_HOSTS, pool_size=HTTP_POOL_SIZE):
+    """A Session with pooled, timeout-enforcing adapters and the shared default headers"""
+    session = requests.Session()
+    adapter = TimeoutAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': ACCEPT_ENCODING})
+    return session
+
+
+# Global instance
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Get or create the shared session (closed at exit)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+            atexit.register(_session.close)
+            logger.debug(f"HTTP transport ready: {HTTP_POOL_HOSTS} host pools x {HTTP_POOL_SIZE}, {ACCEPT_ENCODING}")
+        return _session
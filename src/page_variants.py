@@ -0,0 +1,92 @@
+"""
+Lighter Page Variants
+AMP and "lite" versions of news pages are often 5-10x smaller than the desktop
+HTML, with far less script and ad markup. When a downloaded page advertises
+<link rel="amphtml">, the URL pattern behind it is learned for the whole domain
+and later articles from that domain are fetched in the lighter form first.
+
+- patterns are matched against PAGE_VARIANT_TEMPLATES; PAGE_VARIANTS pins one per domain
+- a domain whose variant keeps failing the quality check goes back to canonical pages
+- bytes downloaded per article are kept both ways: python src/page_variants.py
+"""
+
+import re
+import html as html_lib
+from urllib.parse import urlsplit, urljoin
+from utils import logger, get_page_variants, save_page_variant
+from extraction_stats import domain_of
+from config import PAGE_VARIANTS, PAGE_VARIANT_TEMPLATES, PAGE_VARIANT_MAX_FAILURES
+
+_AMPHTML_LINK = re.compile(rb'<link\b[^>]*\brel=["\']?amphtml\b[^>]*>', re.IGNORECASE)
+_HREF = re.compile(rb'\bhref=["\']?([^"\'\s>]+)', re.IGNORECASE)
+
+
+def expand(template, url):
+    """
+    Apply a variant template to an article URL
+
+    Fields: {url} (scheme://host/path without trailing slash), {scheme}, {host}, {path}.
+    URLs with a query string are left alone (None): templates cannot place it reliably.
+    """
+    parts = urlsplit(url)
+    if parts.query or not parts.netloc:
+        return None
+    path = parts.path.rstrip('/')
+    return template.format(url=f"{parts.scheme}://{parts.netloc}{path}", scheme=parts.scheme,
+                           host=parts.netloc, path=path)
+
+
+def find_amphtml(url, html):
+    """Absolute URL of the page's <link rel="amphtml">, found without parsing, or None"""
+    link = _AMPHTML_LINK.search(html)
+    href = _HREF.search(link.group()) if link else None
+    if not href:
+        return None
+    return urljoin(url, html_lib.unescape(href.group(1).decode('utf-8', 'replace')))
+
+
+def learn_variant(url, html):
+    """Record the domain's variant template if this page links an AMP version matching one"""
+    domain = domain_of(url)
+    if domain in PAGE_VARIANTS or get_page_variants(domain).get(domain, {}).get('template'):
+        return
+    amp_url = find_amphtml(url, html)
+    if not amp_url:
+        return
+    for template in PAGE_VARIANT_TEMPLATES:
+        if expand(template, url) == amp_url:
+            save_page_variant(domain, template)
+            logger.info(f"📦 Learned lighter page variant for {domain}: {template}")
+            return
+    logger.debug(f"AMP link on {domain} matches no known template: {amp_url}")
+
+
+def variant_url(url):
+    """URL of the lighter variant to try first, or None"""
+    domain = domain_of(url)
+    template = PAGE_VARIANTS.get(domain)
+    if not template:
+        row = get_page_variants(domain).get(domain)
+        if not row or not row['template'] or row['failures'] >= PAGE_VARIANT_MAX_FAILURES:
+            return None
+        template = row['template']
+    return expand(template, url)
+
+
+def print_report():
+    """Print the variant template and average bytes per article (lite vs canonical) per domain"""
+    print(f"{'Domain':<28} {'Variant':<34} {'Lite':>6} {'Avg KB':>7} {'Full':>6} {'Avg KB':>7} {'Fails':>5}")
+    rows = sorted(get_page_variants().values(), key=lambda row: row['lite_pages'] + row['full_pages'], reverse=True)
+    for row in rows:
+        template = PAGE_VARIANTS.get(row['domain']) or row['template'] or '-'
+        lite_kb = row['lite_bytes'] / row['lite_pages'] / 1024 if row['lite_pages'] else 0
+        full_kb = row['full_bytes'] / row['full_pages'] / 1024 if row['full_pages'] else 0
+        print(f"{row['domain'][:28]:<28} {template[:34]:<34} {row['lite_pages']:>6} {lite_kb:>7.0f} "
+              f"{row['full_pages']:>6} {full_kb:>7.0f} {row['failures']:>5}")
+
+
+if __name__ == "__main__":
+    from utils import init_database
+
+    init_database()
+    print_report()
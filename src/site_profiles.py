@@ -0,0 +1,128 @@
+"""
+Site Profiles
+Known body/title selectors for the domains most of our articles come from. One
+compiled XPath per profile returns the article paragraphs, with the boilerplate
+nodes already excluded, so a profiled page costs one evaluation on the tree that
+the extractor already parsed. The generic strategies only run when a profile's
+result fails the quality check.
+
+Profiles are JSON files in src/profiles/:
+    domains     hosts the profile applies to (subdomains included, 'www.' ignored)
+    title       XPath of the headline element (first match is used)
+    body        XPath of the article paragraph elements
+    drop        XPath predicates; body nodes inside a matching element are left out
+    early_stop  stop downloading at the first </article> or </main>
+"""
+
+import os
+import json
+import threading
+from urllib.parse import urlparse
+from lxml import etree
+from utils import logger
+
+PROFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+
+
+class SiteProfile:
+    """Compiled selectors for one site"""
+
+    __slots__ = ('name', 'domains', 'body', 'title', 'early_stop')
+
+    def __init__(self, name, domains, body, title=None, drop=(), early_stop=False):
+        self.name = name
+        self.domains = tuple(domains)
+        if drop:
+            body = f"({body})[not(ancestor-or-self::*[{' or '.join(f'({rule})' for rule in drop)}])]"
+        self.body = etree.XPath(body)
+        self.title = etree.XPath(title) if title else None
+        self.early_stop = early_stop
+
+    def extract(self, tree):
+        """Headline and paragraphs as plain text, or None when the selectors match nothing"""
+        paragraphs = [text for text in (node.text_content().strip() for node in self.body(tree)) if text]
+        if not paragraphs:
+            return None
+        headline = self.title(tree) if self.title is not None else []
+        if headline and isinstance(headline[0], etree._Element):
+            title = headline[0].text_content().strip()
+            if title and title not in paragraphs[0]:
+                paragraphs.insert(0, title)
+        return '\n\n'.join(paragraphs)
+
+
+def load_profiles(directory=PROFILES_DIR):
+    """Read every profile file; broken files are logged and skipped"""
+    profiles = {}
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+    except OSError:
+        return profiles
+
+    for name in names:
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                spec = json.load(f)
+            profile = SiteProfile(name[:-5], spec['domains'], spec['body'], spec.get('title'),
+                                  spec.get('drop', ()), spec.get('early_stop', False))
+        except (OSError, ValueError, KeyError, etree.XPathError) as e:
+            logger.warning(f"Skipping site profile {name}: {e}")
+            continue
+        for domain in profile.domains:
+            profiles[domain.lower()] = profile
+    return profiles
+
+
+# Global instance
+_profiles = None
+_profiles_lock = threading.Lock()
+
+
+def get_profiles():
+    """Get or load the global domain -> profile mapping"""
+    global _profiles
+    with _profiles_lock:
+        if _profiles is None:
+            _profiles = load_profiles()
+        return _profiles
+
+
+def profile_for(url):
+    """SiteProfile for a URL's host (or a parent domain of it), or None"""
+    host = (urlparse(url or '').hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    profiles = get_profiles()
+    while host:
+        if host in profiles:
+            return profiles[host]
+        host = host.partition('.')[2]
+    return None
+
+
+# Check profiles against live pages: profile result and time vs the generic strategies
+# Usage: python src/site_profiles.py URL [URL ...]
+if __name__ == "__main__":
+    import sys
+    import time
+    from http_cache import fetch_page
+    from article_extractor import STRATEGIES, parse_html, score_extraction
+    from text_cleaner import clean_text
+
+    for url in sys.argv[1:]:
+        profile = profile_for(url)
+        print(f"\n{url}\n  profile: {profile.name if profile else 'none'}")
+        html = fetch_page(url).content
+        tree = parse_html(html)
+        runs = [('site_profile', lambda: clean_text(profile.extract(tree)))] if profile else []
+        # Generic strategies parse on their own: they modify the tree they are given
+        runs += [(method, lambda strategy=strategy: strategy(url, html)) for method, strategy in STRATEGIES.items()]
+        for method, run in runs:
+            start = time.perf_counter()
+            try:
+                text = run()
+            except Exception as e:
+                text = None
+                print(f"    {method} failed: {e}")
+            elapsed = time.perf_counter() - start
+            print(f"  {method:<14} {elapsed * 1000:8.1f} ms  {len(text or ''):6} chars  quality {score_extraction(text):.2f}")
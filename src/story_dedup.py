@@ -0,0 +1,137 @@
+"""
+Near-Duplicate Story Detection
+BBC, Guardian, Sky and Yahoo often carry the same story under different URLs.
+MinHash signatures over title + summary words, bucketed with LSH, collapse each
+cluster to its best candidate and drop stories we already covered recently.
+"""
+
+import hashlib
+import random
+from array import array
+from keyword_matcher import tokenize
+from utils import logger, get_recent_story_signatures
+from config import STORY_DEDUP_THRESHOLD, STORY_DEDUP_WINDOW_HOURS
+
+NUM_PERM = 64
+LSH_BANDS = 32  # 32 bands x 2 rows: high recall at the thresholds we use, verified afterwards
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+_PRIME = (1 << 61) - 1
+_MASK = 0xFFFFFFFF
+_rng = random.Random(20240201)  # Fixed seed: stored signatures must stay comparable across runs
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# Words that carry no story identity
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have he her his in into is it its of on or
+says said she that the their they this to was were will with after before over up out new
+""".split())
+
+
+def story_tokens(title, summary=""):
+    """Distinct content words of a story"""
+    return {t for t in tokenize(f"{title} {summary}") if t.isalnum() and t not in STOPWORDS}
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little')
+
+
+def compute_signature(title, summary=""):
+    """
+    MinHash signature of a story
+
+    Returns:
+        array('I') of NUM_PERM values, or None if the text has no content words
+    """
+    tokens = story_tokens(title, summary)
+    if not tokens:
+        return None
+    hashes = [_token_hash(t) for t in tokens]
+    return array('I', (min((a * h + b) % _PRIME for h in hashes) & _MASK for a, b in _PERMUTATIONS))
+
+
+def signature_to_bytes(signature):
+    return signature.tobytes() if signature is not None else None
+
+
+def signature_from_bytes(blob):
+    if not blob:
+        return None
+    signature = array('I')
+    signature.frombytes(blob)
+    return signature if len(signature) == NUM_PERM else None
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+class LSHIndex:
+    """Band buckets so each lookup only verifies plausible matches"""
+
+    def __init__(self):
+        self.buckets = {}
+        self.items = []
+
+    def _bands(self, signature):
+        for band in range(LSH_BANDS):
+            start = band * LSH_ROWS
+            yield (band, tuple(signature[start:start + LSH_ROWS]))
+
+    def add(self, signature, label):
+        item_id = len(self.items)
+        self.items.append((signature, label))
+        for key in self._bands(signature):
+            self.buckets.setdefault(key, []).append(item_id)
+
+    def query(self, signature, threshold):
+        """Best (similarity, label) at or above threshold, or None"""
+        candidates = set()
+        for key in self._bands(signature):
+            candidates.update(self.buckets.get(key, ()))
+        best = None
+        for item_id in candidates:
+            stored, label = self.items[item_id]
+            score = similarity(signature, stored)
+            if score >= threshold and (best is None or score > best[0]):
+                best = (score, label)
+        return best
+
+
+class StoryDeduplicator:
+    """
+    Near-duplicate bookkeeping for one run
+
+    Holds the LSH index of recently published stories; within-run collapsing is
+    done by the candidate selector, which reports into `collapsed`.
+    """
+
+    def __init__(self, recent=(), threshold=STORY_DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self.recent = LSHIndex()
+        self.collapsed = 0
+        self.recent_matches = 0
+        for title, blob in recent:
+            signature = signature_from_bytes(blob)
+            if signature is not None:
+                self.recent.add(signature, title)
+
+    @classmethod
+    def from_database(cls, hours=STORY_DEDUP_WINDOW_HOURS, threshold=STORY_DEDUP_THRESHOLD):
+        """Deduplicator primed with stories published in the last `hours` hours"""
+        return cls(get_recent_story_signatures(hours), threshold)
+
+    def matches_recent(self, title, signature):
+        """True if the story was already published within the recent window"""
+        match = self.recent.query(signature, self.threshold)
+        if match:
+            self.recent_matches += 1
+            logger.debug(f"Already covered ({match[0]:.2f}): {title[:50]} ~ {match[1][:50]}")
+            return True
+        return False
+
+    def summary(self, saved_calls):
+        return (f"Near-duplicate filter: {self.collapsed} collapsed within run, "
+                f"{self.recent_matches} already covered -> {saved_calls} LLM calls saved")
@@ -0,0 +1,82 @@
+"""
+JSON-LD Article Data
+Most sports publishers embed schema.org NewsArticle JSON-LD with the full
+articleBody, headline, datePublished and image. The script blocks are found with
+a byte-level regex and decoded with json, so a page that has them is extracted
+without building a DOM or running any content heuristics.
+"""
+
+import re
+import json
+import html as html_lib
+
+_JSON_LD = re.compile(rb'<script[^>]+application/ld\+json[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+_PARAGRAPH_END = re.compile(r'</p\s*>|<br\s*/?>', re.IGNORECASE)
+_TAG = re.compile(r'<[^>]+>')
+
+# schema.org types that carry a complete article body (LiveBlogPosting bodies are partial)
+ARTICLE_TYPES = frozenset({'Article', 'NewsArticle', 'ReportageNewsArticle', 'AnalysisNewsArticle',
+                           'OpinionNewsArticle', 'BackgroundNewsArticle', 'ReviewNewsArticle', 'BlogPosting'})
+
+
+def _nodes(data):
+    """Every object in a JSON-LD document, following lists and @graph"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if '@graph' in data:
+            yield from _nodes(data['@graph'])
+
+
+def _is_article(node):
+    types = node.get('@type')
+    types = types if isinstance(types, list) else [types]
+    return any(t in ARTICLE_TYPES for t in types if isinstance(t, str))
+
+
+def _image_url(image):
+    """image may be a URL, an ImageObject or a list of either"""
+    if isinstance(image, list):
+        image = image[0] if image else None
+    if isinstance(image, dict):
+        image = image.get('url') or image.get('contentUrl')
+    return image if isinstance(image, str) else None
+
+
+def _plain_text(body):
+    """articleBody is usually plain text, sometimes escaped or raw markup"""
+    body = html_lib.unescape(body)
+    if '<' in body:
+        body = _TAG.sub('', _PARAGRAPH_END.sub('\n\n', body))
+    return body.strip()
+
+
+def find_article(html):
+    """
+    First schema.org article with an articleBody in a page's JSON-LD
+
+    Args:
+        html: Raw page bytes
+
+    Returns:
+        dict with body, headline, published, image (missing fields are None), or None
+    """
+    for match in _JSON_LD.finditer(html):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            continue  # Invalid JSON-LD is common; other blocks may still be fine
+        for node in _nodes(data):
+            body = node.get('articleBody')
+            if not _is_article(node) or not isinstance(body, str) or not body.strip():
+                continue
+            headline = node.get('headline')
+            return {
+                'body': _plain_text(body),
+                'headline': html_lib.unescape(headline).strip() if isinstance(headline, str) else None,
+                'published': node.get('datePublished') if isinstance(node.get('datePublished'), str) else None,
+                'image': _image_url(node.get('image')),
+            }
+    return None
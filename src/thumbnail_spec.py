@@ -6,6 +6,7 @@ Based on Image_Guide.md v2.0 for Z-Image Turbo optimization
 import json
 from typing import Dict, Optional
 from utils import logger
+from keyword_matcher import KeywordMatcher
 
 
 class ThumbnailSpecBuilder:
@@ -48,41 +49,45 @@ class ThumbnailSpecBuilder:
         "juventus": "black and white",
     }
     
+    # Keyword groups in precedence order (first group with a hit wins)
+    SPORT_KEYWORDS = {
+        "cricket": ['cricket', 'ipl', 'indian premier league', 't20', 'test', 'odi', 'wicket', 'batting', 'bowling'],
+        "football": ['football', 'soccer', 'premier league', 'champions league', 'ucl', 'goal'],
+        "basketball": ['basketball', 'nba', 'ncaa', 'dunk', 'three-pointer'],
+        "ufc": ['ufc', 'mma', 'boxing', 'punch', 'knockout'],
+        "f1": ['f1', 'formula', 'racing', 'driver', 'pit stop'],
+    }
+    
+    NEWS_TYPE_KEYWORDS = {
+        "political": ['boycott', 'ban', 'suspended', 'controversy', 'protest', 'political', 'diplomatic'],
+        "transfer": ['transfer', 'signs', 'joins', 'deal', 'contract', '£', 'move'],
+        "injury": ['injury', 'injured', 'ruled out', 'sidelined', 'fitness', 'recovery'],
+        "matchup": ['vs', 'v', 'beat', 'defeat', 'win', 'loss', 'draw', 'final', 'semi-final', 'match'],
+        "performance": ['record', 'milestone', 'century', 'hat-trick', 'performance', 'score'],
+    }
+    
+    # Compiled once; a single pass over the text serves every group
+    SPORT_MATCHER = KeywordMatcher(*SPORT_KEYWORDS.values())
+    NEWS_TYPE_MATCHER = KeywordMatcher(*NEWS_TYPE_KEYWORDS.values())
+    
+    @staticmethod
+    def _first_group(hits: set, groups: Dict, default: str) -> str:
+        for name, keywords in groups.items():
+            if hits.intersection(keywords):
+                return name
+        return default
+    
     @staticmethod
     def detect_sport(title: str, content: str = "") -> str:
         """Detect sport from title and content"""
-        text = f"{title} {content}".lower()
-        
-        if any(kw in text for kw in ['cricket', 'ipl', 't20', 'test', 'odi', 'wicket', 'batting', 'bowling']):
-            return "cricket"
-        elif any(kw in text for kw in ['football', 'soccer', 'premier league', 'champions league', 'ucl', 'goal']):
-            return "football"
-        elif any(kw in text for kw in ['basketball', 'nba', 'ncaa', 'dunk', 'three-pointer']):
-            return "basketball"
-        elif any(kw in text for kw in ['ufc', 'mma', 'boxing', 'punch', 'knockout']):
-            return "ufc"
-        elif any(kw in text for kw in ['f1', 'formula', 'racing', 'driver', 'pit stop']):
-            return "f1"
-        else:
-            return "sports"
+        hits = ThumbnailSpecBuilder.SPORT_MATCHER.find(f"{title} {content}")
+        return ThumbnailSpecBuilder._first_group(hits, ThumbnailSpecBuilder.SPORT_KEYWORDS, "sports")
     
     @staticmethod
     def detect_news_type(title: str, content: str = "") -> str:
         """Detect news type from title and content"""
-        text = f"{title} {content}".lower()
-        
-        if any(kw in text for kw in ['boycott', 'ban', 'suspended', 'controversy', 'protest', 'political', 'diplomatic']):
-            return "political"
-        elif any(kw in text for kw in ['transfer', 'signs', 'joins', 'deal', 'contract', '£', 'move']):
-            return "transfer"
-        elif any(kw in text for kw in ['injury', 'injured', 'ruled out', 'sidelined', 'fitness', 'recovery']):
-            return "injury"
-        elif any(kw in text for kw in ['vs', 'v ', 'beat', 'defeat', 'win', 'loss', 'draw', 'final', 'semi-final', 'match']):
-            return "matchup"
-        elif any(kw in text for kw in ['record', 'milestone', 'century', 'hat-trick', 'performance', 'score']):
-            return "performance"
-        else:
-            return "news"
+        hits = ThumbnailSpecBuilder.NEWS_TYPE_MATCHER.find(f"{title} {content}")
+        return ThumbnailSpecBuilder._first_group(hits, ThumbnailSpecBuilder.NEWS_TYPE_KEYWORDS, "news")
     
     @staticmethod
     def extract_teams(title: str) -> tuple:
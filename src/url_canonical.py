@@ -0,0 +1,118 @@
+"""
+URL Canonicalization
+The same article reaches us under many URLs: tracking parameters (utm_*, at_*),
+AMP variants, trailing slashes and feed-proxy redirects. Dedup and the processed
+articles table use the canonical form so a story is only ever processed once.
+
+The canonical form is a key, not an address: pages are fetched and credited from
+the feed link itself, or from where a proxy/shortener link redirects (article_urls).
+
+Redirects are only followed for known proxy/shortener hosts and the result is
+cached in SQLite, so a normal run makes no extra requests.
+"""
+
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from utils import logger, get_url_redirect, save_url_redirect
+from http_transport import get_session
+from config import URL_REDIRECT_HOSTS, URL_REDIRECT_CACHE_HOURS, URL_REDIRECT_TIMEOUT
+
+# Query parameters that only identify the campaign/referrer, never the article
+TRACKING_PARAM_PREFIXES = ('utm_', 'at_', 'ns_', 'mc_', 'pk_')
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'ocid', 'cmp', 'cmpid', 'icid',
+    'guccounter', 'guce_referrer', 'guce_referrer_sig', 'amp', 'outputtype',
+})
+
+# '/amp', '/amp/' and '.amp' endings are dropped; 'story.amp.html' becomes 'story.html'
+_AMP_PATH = re.compile(r'(?:/amp/?|\.amp)$', re.IGNORECASE)
+_AMP_HTML = re.compile(r'\.amp(\.html?)$', re.IGNORECASE)
+
+_DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def canonicalize_url(url):
+    """
+    Normalize a URL without any network access
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters, AMP markers and trailing slashes, and sorts the remaining query.
+    """
+    if not url:
+        return url
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return url
+
+    host = parts.hostname
+    if host.startswith('amp.'):
+        host = f"www.{host[4:]}"  # amp.theguardian.com serves www.theguardian.com pages
+    if parts.port and str(parts.port) != _DEFAULT_PORTS[parts.scheme]:
+        host = f"{host}:{parts.port}"
+
+    path = _AMP_HTML.sub(r'\1', _AMP_PATH.sub('', parts.path)) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)]
+    query.sort()
+
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ''))
+
+
+def _needs_resolution(url):
+    host = (urlsplit(url).hostname or '').lower()
+    return any(host == proxy or host.endswith(f".{proxy}") for proxy in URL_REDIRECT_HOSTS)
+
+
+def resolve_redirects(url, timeout=URL_REDIRECT_TIMEOUT):
+    """
+    Final URL after redirects, for proxy/shortener hosts only (cached in SQLite)
+
+    Falls back to the input URL if the chain cannot be followed; that outcome is
+    cached too so a broken proxy is not retried every run.
+    """
+    if not url or not _needs_resolution(url):
+        return url
+
+    cached = get_url_redirect(url, URL_REDIRECT_CACHE_HOURS)
+    if cached:
+        return cached
+
+    resolved = url
+    try:
+        resp = get_session().head(url, allow_redirects=True, timeout=timeout)
+        if resp.status_code in (403, 405):
+            # Some proxies refuse HEAD; stream a GET so only headers are read
+            resp = get_session().get(url, allow_redirects=True, timeout=timeout, stream=True)
+            resp.close()
+        resolved = resp.url or url
+        logger.debug(f"Resolved redirect: {url} -> {resolved}")
+    except requests.RequestException as e:
+        logger.warning(f"Could not resolve redirect for {url}: {e}")
+
+    save_url_redirect(url, resolved)
+    return resolved
+
+
+def article_urls(url):
+    """
+    URLs of a feed link: (fetch URL, canonical URL)
+
+    The fetch URL is the link itself, or the redirect target for proxy/shortener
+    links; it is what gets downloaded and credited as the source. The canonical URL
+    is the dedup key.
+    """
+    proxy = canonicalize_url(url)
+    resolved = resolve_redirects(proxy)
+    return (url if resolved == proxy else resolved), canonicalize_url(resolved)
+
+
+def canonical_url(url):
+    """Canonical form used as the dedup key"""
+    return article_urls(url)[1]
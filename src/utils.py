@@ -4,7 +4,10 @@ import sqlite3
 import hashlib
 import re
 import logging
+import atexit
+import threading
 from contextlib import contextmanager
+from dedup_index import build_index, SortedHashIndex
 
 # Configure logging
 logging.basicConfig(
@@ -14,21 +17,139 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 DB_PATH = os.getenv('DB_PATH', 'news_cache.db')
+DEDUP_INDEX = os.getenv('DEDUP_INDEX', 'off')  # 'off', 'bloom' or 'sorted' (startup scan: for very large tables)
+DEDUP_INDEX_SNAPSHOT = os.getenv('DEDUP_INDEX_SNAPSHOT', f"{DB_PATH}.idx")  # Used by 'sorted'
+
+# SQLite's default limit on bound parameters is 999 on older builds
+SQL_CHUNK_SIZE = 500
+
+def url_hash(url):
+    """Hash used as the dedup key for an article URL"""
+    return hashlib.md5(url.encode()).hexdigest()
+
+class NewsDatabase:
+    """
+    Persistent SQLite connection shared by the whole run
+    WAL mode lets feed threads read while another thread writes
+    """
+    
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.lock = threading.RLock()
+        self.index = None  # Optional in-memory seen-URL front (see dedup_index)
+    
+    def load_index(self, kind=DEDUP_INDEX, snapshot_path=DEDUP_INDEX_SNAPSHOT):
+        """Load articles.url_hash into an in-memory index consulted before SQLite"""
+        if kind in (None, '', 'off'):
+            self.index = None
+            return
+        
+        with self.transaction() as conn:
+            row_count, max_id = conn.execute('SELECT COUNT(*), COALESCE(MAX(id), 0) FROM articles').fetchone()
+            
+            index = None
+            if kind == 'sorted' and snapshot_path:
+                index = SortedHashIndex.load(snapshot_path, row_count, max_id)
+            
+            if index is None:
+                rows = conn.execute('SELECT url_hash FROM articles')
+                index = build_index(kind, (row[0] for row in rows), expected=row_count)
+                if kind == 'sorted' and snapshot_path:
+                    try:
+                        index.save(snapshot_path, row_count, max_id)
+                    except OSError as e:
+                        logger.warning(f"Could not write dedup index snapshot: {e}")
+        
+        self.index = index
+        logger.info(f"Loaded {kind} dedup index: {row_count} URLs, {index.nbytes / 1024:.1f}KB")
+    
+    @contextmanager
+    def transaction(self):
+        """Serialize access to the shared connection and commit/rollback as a unit"""
+        with self.lock:
+            try:
+                yield self.conn
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                logger.error(f"Database error: {str(e)}")
+                raise
+    
+    def is_duplicate(self, url):
+        """Check if article already processed"""
+        h = url_hash(url)
+        # A negative from the index is definitive; positives are confirmed in SQLite
+        if self.index is not None and not self.index.might_contain(h):
+            return False
+        with self.transaction() as conn:
+            result = conn.execute('SELECT 1 FROM articles WHERE url_hash = ?', (h,)).fetchone()
+            return result is not None
+    
+    def filter_unseen(self, urls):
+        """
+        Resolve a whole batch of URLs against the articles table
+        
+        Returns:
+            list: URLs not yet processed, in input order, without repeats
+        """
+        hashes = {}
+        for url in urls:
+            if url and url not in hashes:
+                hashes[url] = url_hash(url)
+        
+        seen = set()
+        unique_hashes = list(set(hashes.values()))
+        if self.index is not None:
+            unique_hashes = [h for h in unique_hashes if self.index.might_contain(h)]
+        with self.transaction() as conn:
+            for i in range(0, len(unique_hashes), SQL_CHUNK_SIZE):
+                chunk = unique_hashes[i:i + SQL_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f'SELECT url_hash FROM articles WHERE url_hash IN ({placeholders})', chunk)
+                seen.update(row[0] for row in rows)
+        
+        return [url for url, h in hashes.items() if h not in seen]
+    
+    def mark_processed(self, url, title, wp_post_id=None):
+        """Mark article as processed"""
+        self.mark_processed_many([(url, title, wp_post_id)])
+    
+    def mark_processed_many(self, items):
+        """Mark several (url, title, wp_post_id) tuples as processed in one transaction"""
+        rows = [(url_hash(url), title, wp_post_id) for url, title, wp_post_id in items]
+        with self.transaction() as conn:
+            conn.executemany('INSERT OR IGNORE INTO articles (url_hash, title, wp_post_id) VALUES (?, ?, ?)', rows)
+        if self.index is not None:
+            for row in rows:
+                self.index.add(row[0])
+    
+    def close(self):
+        """Close the shared connection"""
+        with self.lock:
+            self.conn.close()
+
+# Global instance
+_database = None
+_database_lock = threading.Lock()
+
+def get_database():
+    """Get or create the global database instance"""
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = NewsDatabase()
+            atexit.register(_database.close)
+        return _database
 
 @contextmanager
 def get_db():
     """Database context manager with proper error handling"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    try:
+    with get_database().transaction() as conn:
         yield conn
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Database error: {str(e)}")
-        raise
-    finally:
-        conn.close()
 
 def init_database():
     """Initialize database schema"""
@@ -43,21 +164,355 @@ def init_database():
             )
         ''')
         conn.execute('CREATE INDEX IF NOT EXISTS idx_url_hash ON articles(url_hash)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS feed_cache (
+                feed_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS story_signatures (
+                url_hash TEXT PRIMARY KEY,
+                title TEXT,
+                signature BLOB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_story_created ON story_signatures(created_at)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS feed_stats (
+                feed_url TEXT PRIMARY KEY,
+                fetches INTEGER DEFAULT 0,
+                errors INTEGER DEFAULT 0,
+                consecutive_errors INTEGER DEFAULT 0,
+                total_latency REAL DEFAULT 0,
+                new_entries INTEGER DEFAULT 0,
+                yield_avg REAL,
+                last_success REAL,
+                last_attempt REAL,
+                next_poll_at REAL DEFAULT 0
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS feed_watermarks (
+                feed_url TEXT PRIMARY KEY,
+                guid TEXT,
+                published REAL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS extraction_stats (
+                domain TEXT,
+                method TEXT,
+                attempts INTEGER DEFAULT 0,
+                successes INTEGER DEFAULT 0,
+                wins INTEGER DEFAULT 0,
+                total_latency REAL DEFAULT 0,
+                PRIMARY KEY (domain, method)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS extraction_domains (
+                domain TEXT PRIMARY KEY,
+                extractions INTEGER DEFAULT 0,
+                failures INTEGER DEFAULT 0,
+                total_time REAL DEFAULT 0
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS url_redirects (
+                url TEXT PRIMARY KEY,
+                resolved TEXT,
+                resolved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS page_variants (
+                domain TEXT PRIMARY KEY,
+                template TEXT,
+                discovered_at TIMESTAMP,
+                failures INTEGER DEFAULT 0,
+                lite_pages INTEGER DEFAULT 0,
+                lite_bytes INTEGER DEFAULT 0,
+                full_pages INTEGER DEFAULT 0,
+                full_bytes INTEGER DEFAULT 0
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS domain_blocks (
+                domain TEXT,
+                failure_class TEXT,
+                expires_at REAL,
+                hits INTEGER DEFAULT 0,
+                PRIMARY KEY (domain, failure_class)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS paragraph_fingerprints (
+                domain TEXT,
+                fingerprint TEXT,
+                pages INTEGER DEFAULT 0,
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (domain, fingerprint)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS fingerprint_domains (
+                domain TEXT PRIMARY KEY,
+                pages INTEGER DEFAULT 0
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS fingerprint_pages (
+                url TEXT PRIMARY KEY,
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
         logger.info("Database initialized")
+    
+    get_database().load_index()
 
 def is_duplicate(url):
     """Check if article already processed"""
-    url_hash = hashlib.md5(url.encode()).hexdigest()
-    with get_db() as conn:
-        result = conn.execute('SELECT 1 FROM articles WHERE url_hash = ?', (url_hash,)).fetchone()
-        return result is not None
+    return get_database().is_duplicate(url)
+
+def filter_unseen(urls):
+    """Return the URLs that have not been processed yet (one query per batch)"""
+    return get_database().filter_unseen(urls)
 
 def mark_processed(url, title, wp_post_id=None):
     """Mark article as processed"""
-    url_hash = hashlib.md5(url.encode()).hexdigest()
+    get_database().mark_processed(url, title, wp_post_id)
+
+def mark_processed_many(items):
+    """Mark several (url, title, wp_post_id) tuples as processed in one transaction"""
+    get_database().mark_processed_many(items)
+
+def get_feed_validators(feed_url):
+    """Get stored HTTP validators for a feed (etag, last_modified, body_hash)"""
+    with get_db() as conn:
+        row = conn.execute('SELECT etag, last_modified, body_hash FROM feed_cache WHERE feed_url = ?',
+                           (feed_url,)).fetchone()
+        return dict(row) if row else {}
+
+def save_feed_validators(feed_url, etag=None, last_modified=None, body_hash=None):
+    """Store HTTP validators for a feed after a successful fetch"""
+    with get_db() as conn:
+        conn.execute('''
+            INSERT INTO feed_cache (feed_url, etag, last_modified, body_hash, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                body_hash = excluded.body_hash,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (feed_url, etag, last_modified, body_hash))
+
+def get_feed_watermark(feed_url):
+    """Get the newest entry seen in a feed (guid, published epoch)"""
+    with get_db() as conn:
+        row = conn.execute('SELECT guid, published FROM feed_watermarks WHERE feed_url = ?', (feed_url,)).fetchone()
+        return dict(row) if row else {}
+
+def save_feed_watermark(feed_url, guid, published=None):
+    """Store the newest entry seen in a feed"""
+    with get_db() as conn:
+        conn.execute('INSERT OR REPLACE INTO feed_watermarks (feed_url, guid, published, updated_at) '
+                     'VALUES (?, ?, ?, CURRENT_TIMESTAMP)', (feed_url, guid, published))
+
+def save_story_signature(url, title, signature):
+    """Store the near-duplicate signature (bytes) of a published story"""
+    with get_db() as conn:
+        conn.execute('INSERT OR REPLACE INTO story_signatures (url_hash, title, signature) VALUES (?, ?, ?)',
+                     (url_hash(url), title, signature))
+
+def get_recent_story_signatures(hours):
+    """Get (title, signature) for stories stored in the last `hours` hours"""
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT title, signature FROM story_signatures WHERE created_at >= datetime('now', ?)",
+            (f'-{int(hours)} hours',)
+        ).fetchall()
+        return [(row['title'], row['signature']) for row in rows]
+
+FEED_STATS_FIELDS = ('fetches', 'errors', 'consecutive_errors', 'total_latency', 'new_entries',
+                     'yield_avg', 'last_success', 'last_attempt', 'next_poll_at')
+
+def get_feed_stats():
+    """Get health stats for every feed, keyed by feed URL (times are unix epoch seconds)"""
+    with get_db() as conn:
+        rows = conn.execute('SELECT * FROM feed_stats').fetchall()
+        return {row['feed_url']: dict(row) for row in rows}
+
+def save_feed_stats(feed_url, stats):
+    """Store a feed's health stats row"""
+    values = [stats.get(field) for field in FEED_STATS_FIELDS]
+    with get_db() as conn:
+        conn.execute(f'''
+            INSERT OR REPLACE INTO feed_stats (feed_url, {', '.join(FEED_STATS_FIELDS)})
+            VALUES (?, {', '.join('?' * len(FEED_STATS_FIELDS))})
+        ''', [feed_url] + values)
+
+def record_extraction(domain, attempts, winner, elapsed):
+    """
+    Store the outcome of one article extraction
+    
+    Args:
+        attempts: (method, succeeded, seconds) for every strategy that ran
+        winner: Method whose text was used, or None if extraction failed
+        elapsed: Total extraction time including the download
+    """
+    with get_db() as conn:
+        conn.executemany('''
+            INSERT INTO extraction_stats (domain, method, attempts, successes, wins, total_latency)
+            VALUES (?, ?, 1, ?, ?, ?)
+            ON CONFLICT(domain, method) DO UPDATE SET
+                attempts = attempts + 1,
+                successes = successes + excluded.successes,
+                wins = wins + excluded.wins,
+                total_latency = total_latency + excluded.total_latency
+        ''', [(domain, method, int(ok), int(method == winner), seconds) for method, ok, seconds in attempts])
+        conn.execute('''
+            INSERT INTO extraction_domains (domain, extractions, failures, total_time)
+            VALUES (?, 1, ?, ?)
+            ON CONFLICT(domain) DO UPDATE SET
+                extractions = extractions + 1,
+                failures = failures + excluded.failures,
+                total_time = total_time + excluded.total_time
+        ''', (domain, int(winner is None), elapsed))
+
+def get_extraction_stats(domain=None):
+    """Per-strategy extraction stats as {domain: {method: row}}, optionally for one domain"""
+    with get_db() as conn:
+        if domain is None:
+            rows = conn.execute('SELECT * FROM extraction_stats').fetchall()
+        else:
+            rows = conn.execute('SELECT * FROM extraction_stats WHERE domain = ?', (domain,)).fetchall()
+        stats = {}
+        for row in rows:
+            stats.setdefault(row['domain'], {})[row['method']] = dict(row)
+        return stats
+
+def get_extraction_domains():
+    """Per-domain extraction totals keyed by domain"""
+    with get_db() as conn:
+        rows = conn.execute('SELECT * FROM extraction_domains').fetchall()
+        return {row['domain']: dict(row) for row in rows}
+
+def get_url_redirect(url, max_age_hours):
+    """Get the cached redirect target of a URL, if resolved within max_age_hours"""
+    with get_db() as conn:
+        row = conn.execute(
+            "SELECT resolved FROM url_redirects WHERE url = ? AND resolved_at >= datetime('now', ?)",
+            (url, f'-{int(max_age_hours)} hours')
+        ).fetchone()
+        return row['resolved'] if row else None
+
+def save_url_redirect(url, resolved):
+    """Cache the redirect target of a URL"""
+    with get_db() as conn:
+        conn.execute('INSERT OR REPLACE INTO url_redirects (url, resolved, resolved_at) VALUES (?, ?, CURRENT_TIMESTAMP)',
+                     (url, resolved))
+
+def get_page_variants(domain=None):
+    """Lighter page variant template and download totals, as {domain: row}"""
+    with get_db() as conn:
+        if domain is None:
+            rows = conn.execute('SELECT * FROM page_variants').fetchall()
+        else:
+            rows = conn.execute('SELECT * FROM page_variants WHERE domain = ?', (domain,)).fetchall()
+        return {row['domain']: dict(row) for row in rows}
+
+def save_page_variant(domain, template):
+    """Store the lighter variant URL template discovered for a domain (a known template is kept)"""
+    with get_db() as conn:
+        conn.execute('''
+            INSERT INTO page_variants (domain, template, discovered_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(domain) DO UPDATE SET template = excluded.template, discovered_at = excluded.discovered_at
+            WHERE template IS NULL
+        ''', (domain, template))
+
+def record_page_download(domain, lite, size, usable=True):
+    """
+    Count one article page download for a domain
+
+    Args:
+        lite: True for the lighter variant, False for the canonical page
+        size: Bytes downloaded (0 for cache hits)
+        usable: For lite pages, whether extraction passed; consecutive failures are counted
+    """
+    kind = 'lite' if lite else 'full'
+    with get_db() as conn:
+        conn.execute('INSERT OR IGNORE INTO page_variants (domain) VALUES (?)', (domain,))
+        conn.execute(f'UPDATE page_variants SET {kind}_pages = {kind}_pages + 1, {kind}_bytes = {kind}_bytes + ? '
+                     'WHERE domain = ?', (size, domain))
+        if lite:
+            conn.execute('UPDATE page_variants SET failures = CASE WHEN ? THEN 0 ELSE failures + 1 END '
+                         'WHERE domain = ?', (int(usable), domain))
+
+def get_domain_blocks(now):
+    """Unexpired scraping blocks as {domain: {failure_class: expires_at epoch}}"""
+    with get_db() as conn:
+        rows = conn.execute('SELECT domain, failure_class, expires_at FROM domain_blocks WHERE expires_at > ?',
+                            (now,)).fetchall()
+        blocks = {}
+        for row in rows:
+            blocks.setdefault(row['domain'], {})[row['failure_class']] = row['expires_at']
+        return blocks
+
+def save_domain_block(domain, failure_class, expires_at):
+    """Remember that a domain cannot be scraped until expires_at (epoch)"""
+    with get_db() as conn:
+        conn.execute('''
+            INSERT INTO domain_blocks (domain, failure_class, expires_at, hits) VALUES (?, ?, ?, 1)
+            ON CONFLICT(domain, failure_class) DO UPDATE SET
+                expires_at = excluded.expires_at,
+                hits = hits + 1
+        ''', (domain, failure_class, expires_at))
+
+def record_paragraph_fingerprints(domain, url, fingerprints, prune_days=30):
+    """
+    Count one extracted page's distinct paragraph fingerprints for a domain
+
+    Each URL is counted once: pages extracted again on later runs (filtered, failed or
+    not yet published) must not push their own paragraphs over the boilerplate threshold.
+    Returns False if the page was already counted.
+    """
+    with get_db() as conn:
+        conn.execute("DELETE FROM fingerprint_pages WHERE last_seen < datetime('now', ?)", (f'-{int(prune_days)} days',))
+        if conn.execute('INSERT OR IGNORE INTO fingerprint_pages (url) VALUES (?)', (url,)).rowcount == 0:
+            return False
+        conn.executemany('''
+            INSERT INTO paragraph_fingerprints (domain, fingerprint, pages) VALUES (?, ?, 1)
+            ON CONFLICT(domain, fingerprint) DO UPDATE SET pages = pages + 1, last_seen = CURRENT_TIMESTAMP
+        ''', [(domain, fingerprint) for fingerprint in fingerprints])
+        conn.execute('''
+            INSERT INTO fingerprint_domains (domain, pages) VALUES (?, 1)
+            ON CONFLICT(domain) DO UPDATE SET pages = pages + 1
+        ''', (domain,))
+        # Article paragraphs are seen once; keep the table to what can still become boilerplate
+        conn.execute("DELETE FROM paragraph_fingerprints WHERE pages = 1 AND last_seen < datetime('now', ?)",
+                     (f'-{int(prune_days)} days',))
+        return True
+
+def get_boilerplate_fingerprints(domain, min_pages, min_share):
+    """Fingerprints seen on at least min_pages pages and min_share of all pages of a domain"""
+    with get_db() as conn:
+        rows = conn.execute('''
+            SELECT f.fingerprint FROM paragraph_fingerprints f
+            JOIN fingerprint_domains d ON d.domain = f.domain
+            WHERE f.domain = ? AND f.pages >= ? AND f.pages >= ? * d.pages
+        ''', (domain, min_pages, min_share)).fetchall()
+        return {row['fingerprint'] for row in rows}
+
+def get_fingerprint_domains():
+    """Pages fingerprinted per domain"""
     with get_db() as conn:
-        conn.execute('INSERT OR IGNORE INTO articles (url_hash, title, wp_post_id) VALUES (?, ?, ?)',
-                     (url_hash, title, wp_post_id))
+        return {row['domain']: row['pages'] for row in conn.execute('SELECT * FROM fingerprint_domains').fetchall()}
 
 def validate_env(var, required=True):
     """Validate environment variable"""
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules import each other flat from src/, as when the bot runs with PYTHONPATH=src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
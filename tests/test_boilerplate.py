@@ -0,0 +1,36 @@
+import pytest
+import boilerplate
+import utils
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, '_database', utils.NewsDatabase(str(tmp_path / 'news.db')))
+    monkeypatch.setattr(boilerplate, '_known', {})
+    monkeypatch.setattr(boilerplate, 'BOILERPLATE_LEARNING', True)
+    monkeypatch.setattr(boilerplate, 'BOILERPLATE_MIN_PAGES', 3)
+    monkeypatch.setattr(boilerplate, 'BOILERPLATE_MIN_SHARE', 0.5)
+    utils.init_database()
+    yield
+    utils._database.close()
+
+
+PROMO = "Sign up to our newsletter for the best stories of the day in your inbox."
+
+
+def _page(story):
+    return f"{story} opened the scoring with a header late in the first half.\n\n{PROMO}"
+
+
+def test_reextracted_page_is_counted_once(database):
+    page = _page("Saka")
+    for _ in range(5):
+        assert boilerplate.strip_boilerplate('https://x.com/a/story?utm_source=rss', page) == page
+    assert utils.get_fingerprint_domains() == {'x.com': 1}
+
+
+def test_paragraphs_on_many_pages_are_stripped(database):
+    for story in ("Saka", "Palmer", "Haaland"):
+        boilerplate.strip_boilerplate(f'https://x.com/a/{story.lower()}', _page(story))
+    assert boilerplate.strip_boilerplate('https://x.com/a/salah', _page("Salah")) == \
+        "Salah opened the scoring with a header late in the first half."
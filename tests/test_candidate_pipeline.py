@@ -0,0 +1,27 @@
+import candidate_pipeline
+from candidate_pipeline import PipelineStats, iter_feed_batches, iter_scored, iter_unseen
+from feed_fetcher import FeedResult
+from feed_parser import ParsedFeed
+
+
+def _result(feed_url, links, not_modified=False):
+    entries = [{'title': f'Story {i}', 'link': link, 'id': link, 'summary': ''} for i, link in enumerate(links)]
+    return FeedResult(feed_url, feed=ParsedFeed('Feed', entries, 'lxml'), not_modified=not_modified)
+
+
+def _run(results, monkeypatch):
+    monkeypatch.setattr(candidate_pipeline, 'filter_unseen', lambda urls: list(urls))
+    stats = PipelineStats()
+    batches = iter_feed_batches(results, stats)
+    candidates = list(iter_scored(iter_unseen(batches, stats), lambda title, summary: 5, stats))
+    return candidates, stats
+
+
+def test_unchanged_feed_entries_are_offered_but_not_counted_as_yield(monkeypatch):
+    results = [_result('https://a.com/rss', ['https://a.com/1', 'https://a.com/2']),
+               _result('https://b.com/rss', ['https://b.com/old'], not_modified=True)]
+    candidates, stats = _run(results, monkeypatch)
+
+    assert [c.link for c in candidates] == ['https://a.com/1', 'https://a.com/2', 'https://b.com/old']
+    assert stats.unchanged == 1
+    assert stats.per_feed == {'https://a.com/rss': 2}
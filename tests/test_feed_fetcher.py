@@ -0,0 +1,24 @@
+import pytest
+from feed_fetcher import FeedResult, feed_label, format_timings
+from feed_parser import ParsedFeed
+
+
+@pytest.mark.parametrize('feed_url, label', [
+    ('https://www.bbc.co.uk/sport/football/rss.xml', 'bbc.co.uk/sport/football'),
+    ('https://www.bbc.co.uk/sport/cricket/rss.xml', 'bbc.co.uk/sport/cricket'),
+    ('https://www.espn.com/espn/rss/cricket/news', 'espn.com/espn/cricket/news'),
+    ('https://www.skysports.com/rss/12040', 'skysports.com/12040'),
+    ('https://sports.yahoo.com/rss/', 'sports.yahoo.com'),
+    ('https://x.com/feed.xml?edition=uk', 'x.com?edition=uk'),
+])
+def test_feed_label(feed_url, label):
+    assert feed_label(feed_url) == label
+
+
+def test_format_timings_tells_feeds_on_one_host_apart():
+    feed = ParsedFeed('Feed', [], 'lxml')
+    results = [FeedResult('https://www.bbc.co.uk/sport/football/rss.xml', feed=feed, elapsed=0.4),
+               FeedResult('https://www.bbc.co.uk/sport/cricket/rss.xml', feed=feed, elapsed=0.1, not_modified=True),
+               FeedResult('https://www.bbc.co.uk/sport/tennis/rss.xml', error=OSError('reset'), elapsed=2.0)]
+    assert format_timings(results) == ('bbc.co.uk/sport/football 0.40s, bbc.co.uk/sport/cricket 0.10s 304, '
+                                       'bbc.co.uk/sport/tennis 2.00s ERR')
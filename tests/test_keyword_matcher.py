@@ -0,0 +1,56 @@
+import pytest
+from keyword_matcher import KeywordMatcher, detect_article_type
+from news_bot import CRICKET_TERMS, PRIORITY_MATCHER
+from thumbnail_spec import ThumbnailSpecBuilder
+
+
+def test_word_boundaries():
+    matcher = KeywordMatcher(['test', 'win', 'new zealand'])
+    assert matcher.find("Latest contest: winning run for the News Zealand side") == set()
+    assert matcher.find("New Zealand win the Test") == {'new zealand', 'win', 'test'}
+
+
+def test_plurals_are_listed_not_guessed():
+    matcher = KeywordMatcher(['goal', 'wicket', 'new'])
+    assert matcher.find("Two goals and three wickets") == {'goal', 'wicket'}
+    assert matcher.find("Breaking news") == set()
+
+
+def test_nested_keywords_and_line_breaks():
+    matcher = KeywordMatcher(['final', 'semi-final', 'premier league', 'indian premier league'])
+    assert matcher.find("Semi-finals set as the Indian Premier\nLeague resumes") == {
+        'final', 'semi-final', 'premier league', 'indian premier league'}
+
+
+def test_symbol_keywords():
+    matcher = KeywordMatcher(['£', '$', 'v'])
+    assert matcher.find("£35M bid for Arsenal v Chelsea striker") == {'£', 'v'}
+    assert matcher.matches_any("Agreed for $40m")
+    assert not matcher.matches_any("Everton draw")
+
+
+def test_detect_article_type():
+    assert detect_article_type("Star ruled out for six weeks") == 'injury'
+    assert detect_article_type("Arsenal beat Chelsea in the final") == 'match'
+    assert detect_article_type("Latest contest announced") == 'news'
+
+
+def test_cricket_format_variants():
+    matcher = KeywordMatcher(['t20', 'odi'])
+    assert matcher.find("India clinch T20I series") == {'t20'}
+    assert matcher.find("Three T20Is and two ODIs in the tour schedule") == {'t20', 'odi'}
+
+
+def test_indian_premier_league_counts_as_cricket():
+    hits = PRIORITY_MATCHER.find("Indian Premier League auction: record bid for pacer")
+    assert hits & CRICKET_TERMS
+
+
+@pytest.mark.parametrize('title', [
+    "Kohli hits ton as India win T20I",
+    "Pakistan sweep T20Is against Zimbabwe",
+    "Smith rested for the ODIs",
+    "Indian Premier League auction: record bid for pacer",
+])
+def test_detect_sport_cricket_headlines(title):
+    assert ThumbnailSpecBuilder.detect_sport(title) == 'cricket'
@@ -0,0 +1,23 @@
+from text_cleaner import clean_text
+
+
+def test_phrase_inside_a_sentence_is_kept():
+    text = ("The fine came after the advertisement watchdog cleared the sponsor. "
+            "The club will appeal, and fans who subscribe to the club channel can follow us on matchday.")
+    assert clean_text(text) == text
+
+
+def test_furniture_lines_are_dropped():
+    text = ("The striker scored twice.\n\nAdvertisement\n\nRead more: Five things we learned\n"
+            "Sign up for our daily newsletter\n\nThe coach praised the squad.")
+    assert clean_text(text) == "The striker scored twice.\n\nThe coach praised the squad."
+
+
+def test_paragraphs_whitespace_and_urls():
+    text = "  First   paragraph\twith a link https://x.com/a?b=1 inside.\n\n\n \nSecond paragraph.  "
+    assert clean_text(text) == "First paragraph with a link inside.\n\nSecond paragraph."
+
+
+def test_empty_input():
+    assert clean_text('') is None
+    assert clean_text(None) is None
@@ -0,0 +1,49 @@
+import pytest
+import url_canonical
+from url_canonical import canonicalize_url, article_urls
+
+
+@pytest.mark.parametrize('url, expected', [
+    # Tracking parameters dropped, the rest sorted
+    ('https://x.com/a/story?utm_source=rss&b=2&a=1&fbclid=abc', 'https://x.com/a/story?a=1&b=2'),
+    ('https://x.com/a/story?at_medium=feed&ns_campaign=x', 'https://x.com/a/story'),
+    # Scheme and host lowercased, default port, fragment and trailing slash dropped
+    ('HTTPS://WWW.X.com:443/a/story/#comments', 'https://www.x.com/a/story'),
+    ('http://x.com:8080/a/', 'http://x.com:8080/a'),
+    ('https://x.com/', 'https://x.com/'),
+    # AMP markers: '.amp.html' keeps its extension, the page it stands for exists
+    ('https://x.com/a/story.amp.html', 'https://x.com/a/story.html'),
+    ('https://x.com/a/story.AMP.htm', 'https://x.com/a/story.htm'),
+    ('https://x.com/a/story/amp', 'https://x.com/a/story'),
+    ('https://x.com/a/story/amp/', 'https://x.com/a/story'),
+    ('https://x.com/a/story.amp', 'https://x.com/a/story'),
+    ('https://x.com/a/story?amp=1', 'https://x.com/a/story'),
+    ('https://amp.theguardian.com/sport/story', 'https://www.theguardian.com/sport/story'),
+    # Paths that only contain 'amp' are left alone
+    ('https://x.com/sport/champions', 'https://x.com/sport/champions'),
+    ('https://x.com/amp/story', 'https://x.com/amp/story'),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+@pytest.mark.parametrize('url', ['', None, 'mailto:desk@x.com', 'not a url', 'https://'])
+def test_canonicalize_url_leaves_non_web_urls(url):
+    assert canonicalize_url(url) == url
+
+
+def test_canonicalize_url_is_idempotent():
+    url = canonicalize_url('https://X.com/a/story.amp.html?utm_source=rss&id=7')
+    assert canonicalize_url(url) == url
+
+
+def test_article_urls_fetches_the_feed_link(monkeypatch):
+    monkeypatch.setattr(url_canonical, 'URL_REDIRECT_HOSTS', ())
+    link = 'https://x.com/a/story.amp.html?utm_source=rss'
+    assert article_urls(link) == (link, 'https://x.com/a/story.html')
+
+
+def test_article_urls_fetches_the_redirect_target(monkeypatch):
+    monkeypatch.setattr(url_canonical, 'resolve_redirects', lambda url: 'https://x.com/a/story/?utm_medium=proxy')
+    assert article_urls('https://feeds.proxy.com/~r/x/123') == ('https://x.com/a/story/?utm_medium=proxy',
+                                                                'https://x.com/a/story')